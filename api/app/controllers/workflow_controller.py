@@ -2,11 +2,14 @@
 工作流 API 控制器
 """
 
+import json
 import logging
 import uuid
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -28,11 +31,25 @@ from app.schemas.workflow_schema import (
 from app.core.response_utils import success, fail
 from app.core.exceptions import BusinessException
 from app.core.error_codes import BizCode
+from app.core.workflow.validator import validate_workflow_config as validate_config
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/apps", tags=["workflow"])
 
+# 列表级 TypeAdapter：一次性完成 ORM -> JSON 兼容结构的校验与序列化，
+# 避免逐条构建 Pydantic 模型后再由响应层二次编码
+_execution_list_adapter = TypeAdapter(list[WorkflowExecution])
+_node_execution_list_adapter = TypeAdapter(list[WorkflowNodeExecution])
+
+
+def _dump_models(adapter: TypeAdapter, rows) -> list[dict]:
+    """将 ORM 对象列表批量序列化为 JSON 兼容的字典列表"""
+    return adapter.dump_python(
+        adapter.validate_python(rows, from_attributes=True),
+        mode="json"
+    )
+
 
 # ==================== 工作流配置管理 ====================
 
@@ -279,7 +296,6 @@ async def validate_workflow_config(
                     msg="工作流配置不存在"
                 )
 
-            from app.core.workflow.validator import validate_workflow_config as validate_config
             config_dict = {
                 "nodes": workflow_config.nodes,
                 "edges": workflow_config.edges,
@@ -345,7 +361,7 @@ async def get_workflow_executions(
 
         return success(
             data={
-                "executions": [WorkflowExecution.model_validate(e) for e in executions],
+                "executions": _dump_models(_execution_list_adapter, executions),
                 "statistics": statistics,
                 "pagination": {
                     "limit": limit,
@@ -402,10 +418,8 @@ async def get_workflow_execution(
 
         return success(
             data={
-                "execution": WorkflowExecution.model_validate(execution),
-                "node_executions": [
-                    WorkflowNodeExecution.model_validate(ne) for ne in node_executions
-                ]
+                "execution": WorkflowExecution.model_validate(execution).model_dump(mode="json"),
+                "node_executions": _dump_models(_node_execution_list_adapter, node_executions)
             }
         )
 
@@ -467,9 +481,6 @@ async def run_workflow(
 
         if request.stream:
             # 流式执行
-            from fastapi.responses import StreamingResponse
-            import json
-
             async def event_generator():
                 """生成 SSE 事件
                 
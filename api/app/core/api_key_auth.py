@@ -60,7 +60,7 @@ def require_api_key(
                 })
                 raise BusinessException("API Key 不存在", BizCode.API_KEY_NOT_FOUND)
 
-            api_key_obj = ApiKeyAuthService.validate_api_key(db, api_key)
+            api_key_obj = await ApiKeyAuthService.validate_api_key_async(db, api_key)
             if not api_key_obj:
                 logger.warning("API Key 无效或已过期", extra={
                     "key_prefix": api_key[:10] + "..." if len(api_key) > 10 else api_key,
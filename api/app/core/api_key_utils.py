@@ -1,11 +1,18 @@
 """API Key 工具函数"""
-import secrets
+import base64
+import os
 from typing import Optional, Union
 from datetime import datetime
 
 from app.schemas.api_key_schema import ApiKeyType
-from fastapi import Response
-from fastapi.responses import JSONResponse
+
+# 前缀映射（模块级常量，按字节存储以便直接拼接）
+_PREFIX_BYTES = {
+    ApiKeyType.AGENT: b"sk-agent-",
+    ApiKeyType.CLUSTER: b"sk-multi_agent-",
+    ApiKeyType.WORKFLOW: b"sk-workflow-",
+    ApiKeyType.SERVICE: b"sk-service-"
+}
 
 
 def generate_api_key(key_type: ApiKeyType) -> str:
@@ -18,31 +25,17 @@ def generate_api_key(key_type: ApiKeyType) -> str:
     Returns:
         str: api_key
     """
-    # 前缀映射
-    prefix_map = {
-        ApiKeyType.AGENT: "sk-agent-",
-        ApiKeyType.CLUSTER: "sk-multi_agent-",
-        ApiKeyType.WORKFLOW: "sk-workflow-",
-        ApiKeyType.SERVICE: "sk-service-"
-    }
-
-    prefix = prefix_map[key_type]
-    random_string = secrets.token_urlsafe(32)[:32]  # 32 字符
-    api_key = f"{prefix}{random_string}"
-
-    return api_key
+    # 24 字节随机数经 urlsafe base64 编码后恰好为 32 字符，无填充、无需截断
+    random_bytes = base64.urlsafe_b64encode(os.urandom(24))
+    return (_PREFIX_BYTES[key_type] + random_bytes).decode("ascii")
 
 
 def add_rate_limit_headers(response, headers: dict):
     """统一添加限流响应头"""
-    if isinstance(response, Response):
-        for key, value in headers.items():
-            response.headers[key] = value
-    elif isinstance(response, JSONResponse):
-        for key, value in headers.items():
-            response.headers[key] = value
-    elif hasattr(response, 'headers'):
-        response.headers.update(headers)
+    # Response/JSONResponse 的 MutableHeaders 与普通 dict 均支持 update
+    response_headers = getattr(response, "headers", None)
+    if response_headers is not None:
+        response_headers.update(headers)
 
     return response
 
@@ -2,7 +2,7 @@ import logging
 import logging.handlers
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
 from app.core.config import settings
 from app.core.sensitive_filter import SensitiveDataFilter
@@ -422,7 +422,32 @@ def get_timing_logger() -> logging.Logger:
     return logger
 
 
-def log_time(step_name: str, duration: float, log_file: str = "logs/time.log") -> None:
+def write_time_log(entries: Iterable[str], log_file: str = "logs/time.log") -> None:
+    """Append timing entries to the timing log file in a single open/write.
+    
+    Blocking file I/O; from async code run it via asyncio.to_thread.
+    
+    Args:
+        entries: Preformatted log lines (including trailing newlines)
+        log_file: Timing log file path (default: logs/time.log)
+    """
+    try:
+        log_path = Path(log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("".join(entries))
+    except IOError as e:
+        # Fallback to console only if file write fails
+        print(f"Warning: Could not write to timing log: {e}")
+
+
+def log_time(
+    step_name: str,
+    duration: float,
+    log_file: str = "logs/time.log",
+    sink: Optional[Callable[[str], None]] = None,
+) -> None:
     """Log timing information for performance tracking.
     
     Logs timing information to both file and console (console output is always shown
@@ -433,6 +458,9 @@ def log_time(step_name: str, duration: float, log_file: str = "logs/time.log") -
         step_name: Name of the operation being timed
         duration: Duration in seconds
         log_file: Optional custom log file path (default: logs/time.log)
+        sink: Optional callable receiving the file entry instead of writing it
+            immediately (e.g. list.append to buffer entries and flush them
+            later with write_time_log)
         
     Example:
         >>> log_time("Knowledge Extraction", 2.34)
@@ -450,16 +478,10 @@ def log_time(step_name: str, duration: float, log_file: str = "logs/time.log") -
     # Format timing entry for file
     log_entry = f"[{timestamp}] {step_name}: {duration:.2f} seconds\n"
     
-    # Write to file with error handling
-    try:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(log_entry)
-    except IOError as e:
-        # Fallback to console only if file write fails
-        print(f"Warning: Could not write to timing log: {e}")
+    if sink is not None:
+        sink(log_entry)
+    else:
+        write_time_log((log_entry,), log_file)
     
     # Always print to console (backward compatible behavior)
     print(f"✓ {step_name}: {duration:.2f}s")
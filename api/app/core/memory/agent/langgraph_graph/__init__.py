@@ -11,6 +11,11 @@ Package structure:
 - routing: State routing logic
 - state: State management utilities
 """
+import warnings
+
+# 包级别统一配置一次，read_graph / write_graph 不再各自重复注册
+warnings.filterwarnings("ignore", category=RuntimeWarning)
+
 from app.core.memory.agent.langgraph_graph.read_graph import make_read_graph
 
 __all__ = ['make_read_graph']
\ No newline at end of file
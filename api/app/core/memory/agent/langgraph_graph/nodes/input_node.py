@@ -17,6 +17,8 @@ from langchain_core.messages import AIMessage
 
 logger = logging.getLogger(__name__)
 
+_QUERY_RE = re.compile(r'"query": "(.*?)",')
+
 
 async def create_input_message(
     state: Dict[str, Any],
@@ -106,9 +108,9 @@ async def create_input_message(
     if 'verified_data' in str(last_message):
         try:
             messages_last = str(last_message).replace('\\n', '').replace('\\', '')
-            query_match = re.findall(r'"query": "(.*?)",', messages_last)
+            query_match = _QUERY_RE.search(messages_last)
             if query_match:
-                last_message = query_match[0]
+                last_message = query_match.group(1)
                 logger.debug(
                     f"[create_input_message] Extracted query from verified_data: {last_message}"
                 )
@@ -6,16 +6,20 @@ with parameter transformation logic using the ParameterBuilder service.
 """
 
 import logging
+import sys
 import time
 from typing import Any, Callable, Dict
 
+import orjson
+
 from app.core.memory.agent.langgraph_graph.state.extractors import (
     extract_content_payload,
+    extract_split_result,
     extract_tool_call_id,
 )
 from app.core.memory.agent.mcp_server.services.parameter_builder import ParameterBuilder
 from app.schemas.memory_config_schema import MemoryConfig
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, ToolMessage
 from langgraph.prebuilt import ToolNode
 
 logger = logging.getLogger(__name__)
@@ -41,6 +45,13 @@ class ToolExecutionNode:
         memory_config: MemoryConfig object containing all configuration
     """
 
+    # Built once per tool per graph and read on every invocation: no per-instance __dict__
+    __slots__ = (
+        "tool_node", "id", "tool_name", "namespace", "search_switch", "apply_id",
+        "group_id", "parameter_builder", "storage_type", "user_rag_memory_id",
+        "memory_config", "_id_prefix", "_log_prefix", "_reports_split_result",
+    )
+
     def __init__(
         self,
         tool: Callable,
@@ -71,7 +82,7 @@ class ToolExecutionNode:
         """
         self.tool_node = ToolNode([tool])
         self.id = node_id
-        self.tool_name = tool.name if hasattr(tool, 'name') else str(tool)
+        self.tool_name = sys.intern(getattr(tool, "name", None) or str(tool))
         self.namespace = namespace
         self.search_switch = search_switch
         self.apply_id = apply_id
@@ -80,6 +91,12 @@ class ToolExecutionNode:
         self.storage_type = storage_type
         self.user_rag_memory_id = user_rag_memory_id
         self.memory_config = memory_config
+        # Static prefix of the tool call id, only the call-specific suffix varies per invocation
+        self._id_prefix = f"{self.id}_"
+        # Static log prefix, formatted lazily by the logging framework
+        self._log_prefix = f"[ToolExecutionNode] {self.id}"
+        # Verify results carry split_result, which is published to state for routing
+        self._reports_split_result = self.tool_name == "Verify"
 
         logger.info(
             f"[ToolExecutionNode] Initialized node '{self.id}' for tool '{self.tool_name}'"
@@ -104,42 +121,54 @@ class ToolExecutionNode:
             Updated state with tool result in messages
         """
         messages = state.get("messages", [])
-        logger.debug( self.tool_name)
+        debug_on = logger.isEnabledFor(logging.DEBUG)
+        if debug_on:
+            logger.debug("%s - Executing tool '%s'", self._log_prefix, self.tool_name)
         
         if not messages:
-            logger.warning(f"[ToolExecutionNode] {self.id} - No messages in state")
+            logger.warning("%s - No messages in state", self._log_prefix)
             return {"messages": [AIMessage(content="Error: No messages in state")]}
         
         last_message = messages[-1]
-        logger.debug(
-            f"[ToolExecutionNode] {self.id} - Processing message at {time.time()}"
-        )
+        if debug_on:
+            logger.debug("%s - Processing message at %s", self._log_prefix, time.time())
         
         try:
             # Extract tool call ID using state extractors
             tool_call_id = extract_tool_call_id(last_message)
-            logger.debug(f"[ToolExecutionNode] {self.id} - Extracted tool_call_id: {tool_call_id}")
+            if debug_on:
+                logger.debug("%s - Extracted tool_call_id: %s", self._log_prefix, tool_call_id)
             
         except ValueError as e:
             logger.error(
-                f"[ToolExecutionNode] {self.id} - Failed to extract tool call ID: {e}"
+                "%s - Failed to extract tool call ID: %s", self._log_prefix, e
             )
             return {"messages": [AIMessage(content=f"Error: {str(e)}")]}
         
+        raw_content = getattr(last_message, "content", None)
         try:
-            # Extract content payload using state extractors
-            content = extract_content_payload(last_message)
-            logger.debug(
-                f"[ToolExecutionNode] {self.id} - Extracted content type: {type(content)}, content_keys: {list(content.keys()) if isinstance(content, dict) else 'N/A'}"
-            )
-            # Log raw message content for debugging
-            if hasattr(last_message, 'content'):
-                raw = last_message.content
-                logger.debug(f"[ToolExecutionNode] {self.id} - Raw message content (first 500 chars): {str(raw)[:500]}")
+            # Extract content payload using state extractors. An empty message without
+            # tool calls carries no upstream payload, so the extractor would hand the
+            # empty value straight back; skip it in that case.
+            if not raw_content and not getattr(last_message, "tool_calls", None):
+                content = raw_content
+            else:
+                content = extract_content_payload(last_message)
+            if debug_on:
+                logger.debug(
+                    "%s - Extracted content type: %s, content_keys: %s",
+                    self._log_prefix, type(content), list(content.keys()) if isinstance(content, dict) else 'N/A'
+                )
+                # Log raw message content for debugging
+                if raw_content is not None:
+                    logger.debug(
+                        "%s - Raw message content (first 500 chars): %s",
+                        self._log_prefix, str(raw_content)[:500]
+                    )
             
         except Exception as e:
             logger.error(
-                f"[ToolExecutionNode] {self.id} - Failed to extract content: {e}",
+                "%s - Failed to extract content: %s", self._log_prefix, e,
                 exc_info=True
             )
             content = {}
@@ -157,26 +186,29 @@ class ToolExecutionNode:
                 storage_type=self.storage_type,
                 user_rag_memory_id=self.user_rag_memory_id,
             )
-            logger.debug(
-                f"[ToolExecutionNode] {self.id} - Built tool args with keys: {list(tool_args.keys())}"
-            )
+            if debug_on:
+                logger.debug(
+                    "%s - Built tool args with keys: %s", self._log_prefix, list(tool_args.keys())
+                )
             
         except Exception as e:
             logger.error(
-                f"[ToolExecutionNode] {self.id} - Failed to build tool args: {e}",
+                "%s - Failed to build tool args: %s", self._log_prefix, e,
                 exc_info=True
             )
             return {"messages": [AIMessage(content=f"Error building arguments: {str(e)}")]}
         
-        # Construct tool input message
+        # Construct tool input message. The tool call is built from trusted,
+        # already-normalized values, so skip pydantic validation via model_construct.
         tool_input = {
             "messages": [
-                AIMessage(
+                AIMessage.model_construct(
                     content="",
                     tool_calls=[{
                         "name": self.tool_name,
                         "args": tool_args,
-                        "id": f"{self.id}_{tool_call_id}",
+                        "id": self._id_prefix + tool_call_id,
+                        "type": "tool_call",
                     }]
                 )
             ]
@@ -186,48 +218,53 @@ class ToolExecutionNode:
             # Invoke the tool
             result = await self.tool_node.ainvoke(tool_input)
             
-            logger.debug(
-                f"[ToolExecutionNode] {self.id} - Tool execution completed"
-            )
+            logger.debug("%s - Tool execution completed", self._log_prefix)
             
             # Check for error in tool response
             error_entry = None
             if result and "messages" in result:
                 for msg in result["messages"]:
-                    if hasattr(msg, 'content'):
-                        try:
-                            import json
-                            content = msg.content
-                            if isinstance(content, str):
-                                parsed = json.loads(content)
-                                if isinstance(parsed, dict) and "error" in parsed:
-                                    error_msg = parsed["error"]
-                                    logger.warning(
-                                        f"[ToolExecutionNode] {self.id} - Tool returned error: {error_msg}"
-                                    )
-                                    error_entry = {"tool": self.tool_name, "error": error_msg, "node_id": self.id}
-                        except (json.JSONDecodeError, TypeError):
-                            pass
+                    content = getattr(msg, 'content', None)
+                    # Only content that can hold an "error" key is worth parsing; skip the rest
+                    if not isinstance(content, str) or '"error"' not in content:
+                        continue
+                    try:
+                        parsed = orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if isinstance(parsed, dict) and "error" in parsed:
+                        error_msg = parsed["error"]
+                        logger.warning(
+                            "%s - Tool returned error: %s", self._log_prefix, error_msg
+                        )
+                        error_entry = {"tool": self.tool_name, "error": error_msg, "node_id": self.id}
             
             # Return result with error tracking if error was found
             if error_entry:
                 result["errors"] = [error_entry]
+
+            # Publish routing fields once so downstream edges read state instead of messages
+            result["last_tool_call_id"] = self._id_prefix + tool_call_id
+            if self._reports_split_result:
+                result_messages = result.get("messages") or []
+                result["split_result"] = (
+                    extract_split_result(result_messages[-1]) if result_messages else None
+                ) or ""
             
             return result
             
         except Exception as e:
             logger.error(
-                f"[ToolExecutionNode] {self.id} - Tool execution failed: {e}",
+                "%s - Tool execution failed: %s", self._log_prefix, e,
                 exc_info=True
             )
             # Track error in state and return error message
-            from langchain_core.messages import ToolMessage
             error_entry = {"tool": self.tool_name, "error": str(e), "node_id": self.id}
             return {
                 "messages": [
                     ToolMessage(
                         content=f"Error executing tool: {str(e)}",
-                        tool_call_id=f"{self.id}_{tool_call_id}"
+                        tool_call_id=self._id_prefix + tool_call_id
                     )
                 ],
                 "errors": [error_entry]
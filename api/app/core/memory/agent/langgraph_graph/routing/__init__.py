@@ -1,13 +1,11 @@
 """LangGraph routing logic."""
 
 from app.core.memory.agent.langgraph_graph.routing.routers import (
-    Verify_continue,
     Retrieve_continue,
     Split_continue,
 )
 
 __all__ = [
-    "Verify_continue",
     "Retrieve_continue",
     "Split_continue",
 ]
@@ -4,10 +4,14 @@ from app.core.memory.agent.langgraph_graph.state.extractors import (
     extract_search_switch,
     extract_tool_call_id,
     extract_content_payload,
+    extract_split_result,
+    extract_json_fragment,
 )
 
 __all__ = [
     "extract_search_switch",
     "extract_tool_call_id",
     "extract_content_payload",
+    "extract_split_result",
+    "extract_json_fragment",
 ]
@@ -7,10 +7,46 @@ dictionaries with proper error handling and sensible defaults.
 
 import json
 import logging
+import re
 from typing import Any, Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+_SPLIT_RESULT_RE = re.compile(r'"split_result": "(.*?)"')
+
+# Shared decoder: avoids json.loads' per-call wrapper and backs the raw_decode sweep
+_JSON_DECODER = json.JSONDecoder()
+
+
+def extract_json_fragment(text: str) -> Optional[Any]:
+    """
+    Extract the first JSON object/array embedded in a larger string.
+
+    Single left-to-right sweep: raw_decode is tried at each '{' / '[' position,
+    so no candidate substrings are materialized and nothing can backtrack.
+
+    Args:
+        text: String that may contain a JSON fragment
+
+    Returns:
+        Parsed dict/list, or None if no fragment decodes
+
+    Examples:
+        >>> extract_json_fragment('result: {"a": 1} done')
+        {'a': 1}
+    """
+    for idx, ch in enumerate(text):
+        if ch != "{" and ch != "[":
+            continue
+        try:
+            return _JSON_DECODER.raw_decode(text, idx)[0]
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
 def extract_search_switch(state: dict) -> Optional[str]:
     """
     Extract search_switch from state or messages.
@@ -45,9 +81,8 @@ def extract_search_switch(state: dict) -> Optional[str]:
         # 尝试从 content 中提取（如果是 JSON 格式）
         if hasattr(message, "content"):
             try:
-                import json
                 if isinstance(message.content, str):
-                    content_data = json.loads(message.content)
+                    content_data = _JSON_DECODER.decode(message.content)
                     if isinstance(content_data, dict):
                         search_switch = content_data.get("search_switch")
                         if search_switch is not None:
@@ -101,6 +136,11 @@ def extract_tool_call_id(message: Any) -> str:
     raise ValueError(f"Could not extract tool call ID from message: {type(message)}")
 
 
+def _keys_for_log(value: Any) -> Any:
+    """Dict keys for trace logs, 'list' for anything else."""
+    return list(value.keys()) if isinstance(value, dict) else 'list'
+
+
 def extract_content_payload(message: Any) -> Any:
     """
     Extract content payload from ToolMessage, parsing JSON if needed.
@@ -124,18 +164,24 @@ def extract_content_payload(message: Any) -> Any:
         >>> extract_content_payload(message)
         'plain text'
     """
+    # Runs once per node on payloads that can be large RAG contexts: trace logs are
+    # debug-level and lazily formatted, so no repr of the content is built otherwise
+    debug_on = logger.isEnabledFor(logging.DEBUG)
+
     # Extract raw content
     # For ToolMessages (responses from tools), extract from content
     if hasattr(message, "content"):
         raw_content = message.content
-        logger.info(f"extract_content_payload: raw_content type={type(raw_content)}, value={str(raw_content)[:500]}")
+        if debug_on:
+            logger.debug("extract_content_payload: raw_content type=%s, value=%.500s", type(raw_content), raw_content)
         
         # Handle MCP content format: [{'type': 'text', 'text': '...'}]
         if isinstance(raw_content, list):
             for block in raw_content:
                 if isinstance(block, dict) and block.get('type') == 'text':
                     raw_content = block.get('text', '')
-                    logger.info(f"extract_content_payload: extracted text from MCP format: {str(raw_content)[:300]}")
+                    if debug_on:
+                        logger.debug("extract_content_payload: extracted text from MCP format: %.300s", raw_content)
                     break
         
         # If content is empty and this is an AIMessage with tool_calls,
@@ -149,31 +195,79 @@ def extract_content_payload(message: Any) -> Any:
     
     # If content is already a dict or list, return it directly
     if isinstance(raw_content, (dict, list)):
-        logger.info(f"extract_content_payload: returning raw dict/list with keys={list(raw_content.keys()) if isinstance(raw_content, dict) else 'list'}")
+        if debug_on:
+            logger.debug("extract_content_payload: returning raw dict/list with keys=%s", _keys_for_log(raw_content))
         return raw_content
     
     # Try to parse as JSON
     if isinstance(raw_content, str):
-        # First, try direct JSON parsing
+        # First, try direct JSON parsing. Tool payloads can be large RAG contexts, so the
+        # whole-string parse goes through orjson; anything it rejects still reaches the
+        # stdlib raw_decode sweep below
         try:
-            parsed = json.loads(raw_content)
-            logger.info(f"extract_content_payload: parsed JSON, keys={list(parsed.keys()) if isinstance(parsed, dict) else 'list'}")
+            parsed = orjson.loads(raw_content)
+            if debug_on:
+                logger.debug("extract_content_payload: parsed JSON, keys=%s", _keys_for_log(parsed))
             return parsed
-        except (json.JSONDecodeError, ValueError):
+        except orjson.JSONDecodeError:
             pass
         
         # If that fails, try to extract JSON from the string
         # This handles cases where the content is embedded in a larger string
-        import re
-        json_candidates = re.findall(r'[\[{].*[\]}]', raw_content, flags=re.DOTALL)
-        for candidate in json_candidates:
-            try:
-                parsed = json.loads(candidate)
-                logger.info(f"extract_content_payload: parsed JSON from candidate, keys={list(parsed.keys()) if isinstance(parsed, dict) else 'list'}")
-                return parsed
-            except (json.JSONDecodeError, ValueError):
-                continue
+        parsed = extract_json_fragment(raw_content)
+        if parsed is not None:
+            if debug_on:
+                logger.debug("extract_content_payload: parsed JSON from candidate, keys=%s", _keys_for_log(parsed))
+            return parsed
     
     # If all parsing attempts fail, return the raw content
-    logger.info(f"extract_content_payload: returning raw content (parsing failed)")
+    logger.debug("extract_content_payload: returning raw content (parsing failed)")
     return raw_content
+
+
+def extract_split_result(message: Any) -> Optional[str]:
+    """
+    Extract the verification status (split_result) from a Verify tool result.
+
+    The Verify tool returns ``{"verified_data": {"split_result": ...}, ...}``; the
+    message content may be a dict, a JSON string, or MCP text parts.
+
+    Args:
+        message: Message object (typically ToolMessage)
+
+    Returns:
+        "success" / "failed", or None if no status is present
+
+    Examples:
+        >>> message = ToolMessage(content='{"verified_data": {"split_result": "success"}}')
+        >>> extract_split_result(message)
+        'success'
+    """
+    content = getattr(message, "content", message)
+
+    # Handle MCP content format: [{'type': 'text', 'text': '...'}]
+    if isinstance(content, list):
+        content = "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+
+    if isinstance(content, dict):
+        payload = content
+    else:
+        text = str(content)
+        if "split_result" not in text:
+            return None
+        try:
+            payload = _JSON_DECODER.decode(text)
+        except (json.JSONDecodeError, ValueError):
+            # Not pure JSON: fall back to scanning the unescaped text
+            match = _SPLIT_RESULT_RE.search(text.replace('\\', ''))
+            return match.group(1) if match else None
+
+    if not isinstance(payload, dict):
+        return None
+    verified_data = payload.get("verified_data")
+    if isinstance(verified_data, dict) and "split_result" in verified_data:
+        return verified_data["split_result"]
+    return payload.get("split_result")
@@ -1,7 +1,6 @@
 import asyncio
 import json
 import sys
-import warnings
 from contextlib import asynccontextmanager
 
 from app.core.logging_config import get_agent_logger
@@ -12,8 +11,6 @@ from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 
-warnings.filterwarnings("ignore", category=RuntimeWarning)
-
 logger = get_agent_logger(__name__)
 
 if sys.platform.startswith("win"):
@@ -35,7 +32,8 @@ async def make_write_graph(user_id, tools, apply_id, group_id, memory_config: Me
     logger.info("Loading MCP tools: %s", [t.name for t in tools])
     logger.info(f"Using memory_config: {memory_config.config_name} (id={memory_config.config_id})")
 
-    data_write_tool = next((t for t in tools if t.name == "Data_write"), None)
+    tool_by_name = {t.name: t for t in tools}
+    data_write_tool = tool_by_name.get("Data_write")
 
     if not data_write_tool:
         logger.error("Data_write tool not found", exc_info=True)
@@ -6,12 +6,15 @@ This module provides business logic services for the MCP server:
 - SearchService: Search result processing
 - SessionService: Session and history management
 - ParameterBuilder: Tool parameter construction
+- build_llm_client / get_llm_client: LLM client construction (cached) from MemoryConfig
+- build_llm_client_by_model_id: LLM client construction from a model id
 """
 
 from .template_service import TemplateService, TemplateRenderError
 from .search_service import SearchService
 from .session_service import SessionService
 from .parameter_builder import ParameterBuilder
+from .llm_client_service import build_llm_client, build_llm_client_by_model_id, get_llm_client
 
 
 __all__ = [
@@ -20,4 +23,7 @@ __all__ = [
     "SearchService",
     "SessionService",
     "ParameterBuilder",
+    "build_llm_client",
+    "build_llm_client_by_model_id",
+    "get_llm_client",
 ]
@@ -0,0 +1,94 @@
+"""
+LLM Client Service for building LLM clients from MemoryConfig.
+
+Building a client needs a short-lived DB session to load the model config.
+The helpers here keep that synchronous work in one place so the MCP tools can
+run it off the event loop, and cache the result per configuration.
+"""
+import asyncio
+import threading
+from typing import Hashable, Tuple
+
+from cachetools import TTLCache
+
+from app.core.logging_config import get_agent_logger
+from app.core.memory.llm_tools.openai_client import OpenAIClient
+from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
+from app.db import get_db_context
+from app.schemas.memory_config_schema import MemoryConfig
+
+
+logger = get_agent_logger(__name__)
+
+# (config_id, llm_model_id) -> LLM client. The MCP server runs in its own process and
+# has no invalidation hook, so config/model edits made through the API (e.g. a new
+# API key or base URL) are picked up once the TTL expires.
+_llm_client_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+_llm_client_cache_lock = threading.Lock()
+
+
+def _cache_key(memory_config: MemoryConfig) -> Tuple[Hashable, str]:
+    return memory_config.config_id, str(memory_config.llm_model_id)
+
+
+def build_llm_client(memory_config: MemoryConfig) -> OpenAIClient:
+    """
+    Build the LLM client configured by memory_config.
+
+    Opens its own DB session, so it is safe to call from a worker thread
+    (e.g. via asyncio.to_thread).
+
+    Args:
+        memory_config: MemoryConfig object containing llm_model_id
+
+    Returns:
+        OpenAIClient configured for the LLM model
+    """
+    with get_db_context() as db:
+        factory = MemoryClientFactory(db)
+        return factory.get_llm_client_from_config(memory_config)
+
+
+def build_llm_client_by_model_id(llm_model_id: str) -> OpenAIClient:
+    """
+    Build the LLM client for a model id, for callers that hold no MemoryConfig.
+
+    Opens its own DB session, so it is safe to call from a worker thread
+    (e.g. via asyncio.to_thread).
+
+    Args:
+        llm_model_id: LLM model ID
+
+    Returns:
+        OpenAIClient configured for the LLM model
+    """
+    with get_db_context() as db:
+        return MemoryClientFactory(db).get_llm_client(llm_model_id)
+
+
+def _build_and_cache(memory_config: MemoryConfig) -> OpenAIClient:
+    client = build_llm_client(memory_config)
+    with _llm_client_cache_lock:
+        _llm_client_cache[_cache_key(memory_config)] = client
+    return client
+
+
+async def get_llm_client(memory_config: MemoryConfig) -> OpenAIClient:
+    """
+    Get the LLM client for memory_config, reusing a cached one when available.
+
+    A cache hit returns immediately without touching the database; a miss builds
+    the client in a worker thread and caches it.
+
+    Args:
+        memory_config: MemoryConfig object containing llm_model_id
+
+    Returns:
+        OpenAIClient configured for the LLM model
+    """
+    with _llm_client_cache_lock:
+        client = _llm_client_cache.get(_cache_key(memory_config))
+    if client is not None:
+        return client
+    return await asyncio.to_thread(_build_and_cache, memory_config)
+
@@ -18,6 +18,16 @@ class ParameterBuilder:
 
     def __init__(self):
         """Initialize the parameter builder."""
+        # Tool name -> argument builder, resolved with a single dict lookup
+        self._builders = {
+            "Verify": self._build_dict_context,
+            "Summary": self._build_dict_context,
+            "Summary_fails": self._build_dict_context,
+            "Retrieve_Summary": self._build_dict_context,
+            "Problem_Extension": self._build_dict_context,
+            "Retrieve": self._build_retrieve,
+            "Input_Summary": self._build_input_summary,
+        }
         logger.info("ParameterBuilder initialized")
 
     def build_tool_args(
@@ -56,52 +66,60 @@ class ParameterBuilder:
         Returns:
             Dictionary of tool arguments ready for invocation
         """
-        # Base arguments common to most tools
+        # Base arguments common to all tools; storage_type and user_rag_memory_id default to ""
         base_args = {
             "usermessages": tool_call_id,
             "apply_id": apply_id,
             "group_id": group_id,
             "memory_config": memory_config,
+            "storage_type": storage_type or "",
+            "user_rag_memory_id": user_rag_memory_id or "",
         }
 
-        # Always add storage_type and user_rag_memory_id (with defaults if None)
-        base_args["storage_type"] = storage_type if storage_type is not None else ""
-        base_args["user_rag_memory_id"] = user_rag_memory_id if user_rag_memory_id is not None else ""
-        
-        # Tool-specific argument construction
-        if tool_name in ["Verify", "Summary", "Summary_fails", "Retrieve_Summary", "Problem_Extension"]:
-            # These tools expect dict context
-            return {
-                "context": content if isinstance(content, dict) else {"content": content},
-                **base_args
-            }
+        builder = self._builders.get(tool_name)
+        if builder is None:
+            logger.warning(
+                f"Unknown tool name '{tool_name}', using default argument structure"
+            )
+            builder = self._build_default
+        return builder(content, search_switch, base_args)
 
-        elif tool_name in ["Retrieve"]:
-            return {
-                "context": content if isinstance(content, dict) else {},
-                "search_switch": search_switch,
-                **base_args
-            }
+    @staticmethod
+    def _build_dict_context(content: Any, search_switch: str, base_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Tools expecting a dict context."""
+        return {
+            "context": content if isinstance(content, dict) else {"content": content},
+            **base_args
+        }
 
-        elif tool_name == "Input_Summary":
-            if isinstance(content, dict):
-                # Try to extract message from dict
-                message_str = content.get("sentence", str(content))
-            else:
-                message_str = str(content)
+    @staticmethod
+    def _build_retrieve(content: Any, search_switch: str, base_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Retrieve: dict context plus search_switch."""
+        return {
+            "context": content if isinstance(content, dict) else {},
+            "search_switch": search_switch,
+            **base_args
+        }
 
-            return {
-                "context": message_str,
-                "search_switch": search_switch,
-                **base_args
-            }
-        
+    @staticmethod
+    def _build_input_summary(content: Any, search_switch: str, base_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Input_Summary: raw message string plus search_switch."""
+        if isinstance(content, dict):
+            # Try to extract message from dict
+            message_str = content.get("sentence", str(content))
         else:
-            # Default: pass content as context
-            logger.warning(
-                f"Unknown tool name '{tool_name}', using default argument structure"
-            )
-            return {
-                "context": content,
-                **base_args
-            }
+            message_str = str(content)
+
+        return {
+            "context": message_str,
+            "search_switch": search_switch,
+            **base_args
+        }
+
+    @staticmethod
+    def _build_default(content: Any, search_switch: str, base_args: Dict[str, Any]) -> Dict[str, Any]:
+        """Default: pass content as context."""
+        return {
+            "context": content,
+            **base_args
+        }
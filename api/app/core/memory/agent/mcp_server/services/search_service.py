@@ -8,7 +8,7 @@ and deduplication.
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from app.core.logging_config import get_agent_logger
-from app.core.memory.src.search import run_hybrid_search
+from app.core.memory.src.search import embed_queries, run_hybrid_search
 from app.core.memory.utils.data.text_utils import escape_lucene_query
 
 if TYPE_CHECKING:
@@ -99,6 +99,36 @@ class SearchService:
         
         return q
     
+    async def embed_questions(
+        self,
+        questions: List[str],
+        memory_config: "MemoryConfig" = None,
+    ) -> List[Optional[List[float]]]:
+        """
+        Embed all questions with one embedder request.
+        
+        The vectors line up with ``questions`` and can be passed to
+        execute_hybrid_search as ``query_embedding``. On failure every entry is
+        None, so each search falls back to embedding its own query.
+        
+        Args:
+            questions: Search query texts
+            memory_config: MemoryConfig object for embedding model. Falls back to self.memory_config if not provided.
+        
+        Returns:
+            List of embeddings (None where unavailable)
+        """
+        config = memory_config or self.memory_config
+        if not config or not questions:
+            return [None] * len(questions)
+        try:
+            return await embed_queries(
+                [self.clean_query(q) for q in questions], config
+            )
+        except Exception as e:
+            logger.warning(f"Batch embedding failed, falling back to per-query embedding: {e}")
+            return [None] * len(questions)
+
     async def execute_hybrid_search(
         self,
         group_id: str,
@@ -110,6 +140,7 @@ class SearchService:
         output_path: str = "search_results.json",
         return_raw_results: bool = False,
         memory_config: "MemoryConfig" = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> Tuple[str, str, Optional[dict]]:
         """
         Execute hybrid search and return clean content.
@@ -124,6 +155,7 @@ class SearchService:
             output_path: Path to save search results (default: "search_results.json")
             return_raw_results: If True, also return the raw search results as third element (default: False)
             memory_config: MemoryConfig object for embedding model. Falls back to self.memory_config if not provided.
+            query_embedding: Precomputed query embedding from embed_questions (optional)
         
         Returns:
             Tuple of (clean_content, cleaned_query, raw_results)
@@ -151,6 +183,7 @@ class SearchService:
                 output_path=output_path,
                 memory_config=config,
                 rerank_alpha=rerank_alpha,
+                query_embedding=query_embedding,
             )
             
             # Extract results based on search type and include parameter
@@ -4,7 +4,7 @@ Template Service for loading and rendering Jinja2 templates.
 This service provides centralized template management with caching and error handling.
 """
 import os
-from functools import lru_cache
+from functools import cache
 from typing import Optional
 from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
 
@@ -14,6 +14,23 @@ from app.core.logging_config import get_agent_logger, log_prompt_rendering
 logger = get_agent_logger(__name__)
 
 
+@cache
+def _get_environment(template_root: str) -> Environment:
+    """
+    Get the shared Jinja2 Environment for a template root.
+    
+    One Environment per root for the whole process. Prompt templates ship with
+    the code, so the compiled-template cache is unbounded and never re-stats
+    the source files.
+    """
+    return Environment(
+        loader=FileSystemLoader(template_root),
+        autoescape=False,  # Disable autoescape for prompt templates
+        cache_size=-1,
+        auto_reload=False,
+    )
+
+
 class TemplateRenderError(Exception):
     """Exception raised when template rendering fails."""
     
@@ -37,13 +54,11 @@ class TemplateService:
             template_root: Root directory containing template files
         """
         self.template_root = template_root
-        self.env = Environment(
-            loader=FileSystemLoader(template_root),
-            autoescape=False  # Disable autoescape for prompt templates
-        )
+        self.env = _get_environment(template_root)
+        # Compiled templates by name; avoids the Environment cache key/lock on each hit
+        self._templates: dict[str, Template] = {}
         logger.info(f"TemplateService initialized with root: {template_root}")
     
-    @lru_cache(maxsize=128)
     def _load_template(self, template_name: str) -> Template:
         """
         Load a template from disk with caching.
@@ -57,8 +72,11 @@ class TemplateService:
         Raises:
             TemplateNotFound: If template file doesn't exist
         """
+        template = self._templates.get(template_name)
+        if template is not None:
+            return template
         try:
-            return self.env.get_template(template_name)
+            template = self.env.get_template(template_name)
         except TemplateNotFound as e:
             expected_path = os.path.join(self.template_root, template_name)
             logger.error(
@@ -66,6 +84,8 @@ class TemplateService:
                 f"Expected path: {expected_path}"
             )
             raise
+        self._templates[template_name] = template
+        return template
     
     async def render_template(
         self,
@@ -4,6 +4,7 @@ Data Tools for data type differentiation and writing.
 This module contains MCP tools for distinguishing data types and writing data.
 """
 
+import asyncio
 import os
 
 from app.core.logging_config import get_agent_logger
@@ -12,9 +13,8 @@ from app.core.memory.agent.mcp_server.models.retrieval_models import (
     DistinguishTypeResponse,
 )
 from app.core.memory.agent.mcp_server.server import get_context_resource
+from app.core.memory.agent.mcp_server.services.llm_client_service import get_llm_client
 from app.core.memory.agent.utils.write_tools import write
-from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
-from app.db import get_db_context
 from app.schemas.memory_config_schema import MemoryConfig
 from mcp.server.fastmcp import Context
 
@@ -42,22 +42,24 @@ async def Data_type_differentiation(
         # Extract services from context
         template_service = get_context_resource(ctx, 'template_service')
         
-        # Get LLM client from memory_config using factory pattern
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
-        
-        # Render template
-        try:
-            system_prompt = await template_service.render_template(
+        # Get the (cached) LLM client and render the template concurrently;
+        # neither depends on the other.
+        llm_client, system_prompt = await asyncio.gather(
+            get_llm_client(memory_config),
+            template_service.render_template(
                 template_name='distinguish_types_prompt.jinja2',
                 operation_name='status_typle',
                 user_query=context
-            )
-        except Exception as e:
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(llm_client, Exception):
+            raise llm_client
+        if isinstance(system_prompt, Exception):
+            e = system_prompt
             logger.error(
                 f"Template rendering failed for Data_type_differentiation: {e}",
-                exc_info=True
+                exc_info=e
             )
             return {
                 "type": "error",
@@ -5,9 +5,11 @@ This module contains MCP tools for breaking down and extending user questions.
 LLM clients are constructed from MemoryConfig when needed.
 """
 
-import json
+import asyncio
 import time
+from collections import defaultdict
 
+import orjson
 from app.core.logging_config import get_agent_logger, log_time
 from app.core.memory.agent.mcp_server.mcp_instance import mcp
 from app.core.memory.agent.mcp_server.models.problem_models import (
@@ -15,14 +17,33 @@ from app.core.memory.agent.mcp_server.models.problem_models import (
     ProblemExtensionResponse,
 )
 from app.core.memory.agent.mcp_server.server import get_context_resource
+from app.core.memory.agent.mcp_server.services.llm_client_service import get_llm_client
 from app.core.memory.agent.utils.messages_tool import Problem_Extension_messages_deal
-from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
-from app.db import get_db_context
 from app.schemas.memory_config_schema import MemoryConfig
+from cachetools import TTLCache
 from mcp.server.fastmcp import Context
 
 logger = get_agent_logger(__name__)
 
+# 扩展问题提示词缓存：同一批子问题（如 agent 循环重试）直接复用渲染结果
+# 仅在事件循环线程内访问，无需加锁
+_extension_prompt_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
+async def _render_extension_prompt(template_service, questions: list) -> str:
+    """Render the Problem_Extension prompt, reusing a recent render for the same questions."""
+    key = tuple(questions)
+    prompt = _extension_prompt_cache.get(key)
+    if prompt is None:
+        prompt = await template_service.render_template(
+            template_name='Problem_Extension_prompt.jinja2',
+            operation_name='problem_extension',
+            history=[],
+            questions=questions
+        )
+        _extension_prompt_cache[key] = prompt
+    return prompt
+
 
 @mcp.tool()
 async def Split_The_Problem(
@@ -54,36 +75,30 @@ async def Split_The_Problem(
     try:
         # Extract services from context
         template_service = get_context_resource(ctx, "template_service")
-        session_service = get_context_resource(ctx, "session_service")
 
-        # Get LLM client from memory_config
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
-        
-        # Extract user ID from session
-        user_id = session_service.resolve_user_id(sessionid)
-        
-        # Get conversation history
-        history = await session_service.get_history(user_id, apply_id, group_id)
-        # Override with empty list for now (as in original)
-        history = []
-        
-        # Render template
-        try:
-            system_prompt = await template_service.render_template(
+        # History is not used by the prompt yet (always empty), so it is not fetched.
+        # Get the (cached) LLM client and render the template concurrently;
+        # neither depends on the other.
+        llm_client, system_prompt = await asyncio.gather(
+            get_llm_client(memory_config),
+            template_service.render_template(
                 template_name='problem_breakdown_prompt.jinja2',
                 operation_name='split_the_problem',
-                history=history,
+                history=[],
                 sentence=sentence
-            )
-        except Exception as e:
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(llm_client, Exception):
+            raise llm_client
+        if isinstance(system_prompt, Exception):
+            e = system_prompt
             logger.error(
                 f"Template rendering failed for Split_The_Problem: {e}",
-                exc_info=True
+                exc_info=e
             )
             return {
-                "context": json.dumps([], ensure_ascii=False),
+                "context": "[]",
                 "original": sentence,
                 "error": f"Prompt rendering failed: {str(e)}"
             }
@@ -98,31 +113,28 @@ async def Split_The_Problem(
             # Handle RootModel response with .root attribute access
             if structured is None:
                 # LLM returned None, use empty list as fallback
-                split_result = json.dumps([], ensure_ascii=False)
+                split_list = []
             elif hasattr(structured, 'root') and structured.root is not None:
-                split_result = json.dumps(
-                    [item.model_dump() for item in structured.root],
-                    ensure_ascii=False
-                )
+                split_list = [item.model_dump() for item in structured.root]
             elif isinstance(structured, list):
                 # Fallback: treat structured itself as the list
-                split_result = json.dumps(
-                    [item.model_dump() for item in structured],
-                    ensure_ascii=False
-                )
+                split_list = [item.model_dump() for item in structured]
             else:
                 # Last resort: use empty list
-                split_result = json.dumps([], ensure_ascii=False)
+                split_list = []
                 
         except Exception as e:
             logger.error(
                 f"LLM call failed for Split_The_Problem: {e}",
                 exc_info=True
             )
-            split_result = json.dumps([], ensure_ascii=False)
+            split_list = []
+        
+        # Downstream tools receive the split as a JSON string; serialize it once
+        split_result = orjson.dumps(split_list).decode()
         
         logger.info("Problem splitting")
-        logger.info(f"Problem split result: {split_result}")
+        logger.debug("Problem split result: %s", split_result)
         
         # Emit intermediate output for frontend
         result = {
@@ -130,7 +142,7 @@ async def Split_The_Problem(
             "original": sentence,
             "_intermediate": {
                 "type": "problem_split",
-                "data": json.loads(split_result) if split_result else [],
+                "data": split_list,
                 "original_query": sentence
             }
         }
@@ -143,7 +155,7 @@ async def Split_The_Problem(
             exc_info=True
         )
         return {
-            "context": json.dumps([], ensure_ascii=False),
+            "context": "[]",
             "original": sentence,
             "error": str(e)
         }
@@ -190,22 +202,7 @@ async def Problem_Extension(
     try:
         # Extract services from context
         template_service = get_context_resource(ctx, "template_service")
-        session_service = get_context_resource(ctx, "session_service")
 
-        # Get LLM client from memory_config
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
-        
-        # Resolve session ID from usermessages
-        from app.core.memory.agent.utils.messages_tool import Resolve_username
-        sessionid = Resolve_username(usermessages)
-        
-        # Get conversation history
-        history = await session_service.get_history(sessionid, apply_id, group_id)
-        # Override with empty list for now (as in original)
-        history = []
-        
         # Process context to extract questions
         extent_quest, original = await Problem_Extension_messages_deal(context)
         
@@ -215,18 +212,21 @@ async def Problem_Extension(
             if msg.get("role") == "user":
                 questions_formatted.append(msg.get("content", ""))
         
-        # Render template
-        try:
-            system_prompt = await template_service.render_template(
-                template_name='Problem_Extension_prompt.jinja2',
-                operation_name='problem_extension',
-                history=history,
-                questions=questions_formatted
-            )
-        except Exception as e:
+        # History is not used by the prompt yet (always empty), so it is not fetched.
+        # Get the (cached) LLM client and render the template concurrently;
+        # neither depends on the other.
+        llm_client, system_prompt = await asyncio.gather(
+            get_llm_client(memory_config),
+            _render_extension_prompt(template_service, questions_formatted),
+            return_exceptions=True,
+        )
+        if isinstance(llm_client, Exception):
+            raise llm_client
+        if isinstance(system_prompt, Exception):
+            e = system_prompt
             logger.error(
                 f"Template rendering failed for Problem_Extension: {e}",
-                exc_info=True
+                exc_info=e
             )
             return {
                 "context": {},
@@ -242,17 +242,28 @@ async def Problem_Extension(
             )
             
             # Aggregate results by original question
-            aggregated_dict = {}
-            for item in response_content.root:
-                key = getattr(item, "original_question", None) or (
-                    item.get("original_question") if isinstance(item, dict) else None
-                )
-                value = getattr(item, "extended_question", None) or (
-                    item.get("extended_question") if isinstance(item, dict) else None
-                )
-                if not key or not value:
-                    continue
-                aggregated_dict.setdefault(key, []).append(value)
+            grouped = defaultdict(list)
+            items = response_content.root
+            try:
+                # Fast path: response_structured returns validated ExtendedQuestionItem models
+                for item in items:
+                    key, value = item.original_question, item.extended_question
+                    if key and value:
+                        grouped[key].append(value)
+            except AttributeError:
+                # Heterogeneous payload (e.g. plain dicts): fall back to field-by-field lookup
+                grouped.clear()
+                for item in items:
+                    key = getattr(item, "original_question", None) or (
+                        item.get("original_question") if isinstance(item, dict) else None
+                    )
+                    value = getattr(item, "extended_question", None) or (
+                        item.get("extended_question") if isinstance(item, dict) else None
+                    )
+                    if not key or not value:
+                        continue
+                    grouped[key].append(value)
+            aggregated_dict = dict(grouped)
                 
         except Exception as e:
             logger.error(
@@ -262,7 +273,7 @@ async def Problem_Extension(
             aggregated_dict = {}
         
         logger.info("Problem extension")
-        logger.info(f"Problem extension result: {aggregated_dict}")
+        logger.debug("Problem extension result: %s", aggregated_dict)
         
         # Emit intermediate output for frontend
         result = {
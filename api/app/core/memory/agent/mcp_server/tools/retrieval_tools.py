@@ -4,16 +4,14 @@ Retrieval Tools for database and context retrieval.
 This module contains MCP tools for retrieving data using hybrid search.
 """
 
+import asyncio
 import os
 import time
 
+import orjson
 from app.core.logging_config import get_agent_logger, log_time
 from app.core.memory.agent.mcp_server.mcp_instance import mcp
 from app.core.memory.agent.mcp_server.server import get_context_resource
-from app.core.memory.agent.utils.llm_tools import (
-    deduplicate_entries,
-    merge_to_key_value_pairs,
-)
 from app.core.memory.agent.utils.messages_tool import Retriev_messages_deal
 from app.core.rag.nlp.search import knowledge_retrieval
 from app.schemas.memory_config_schema import MemoryConfig
@@ -23,6 +21,40 @@ from mcp.server.fastmcp import Context
 load_dotenv()
 logger = get_agent_logger(__name__)
 
+# Upper bound on concurrent per-question searches within one Retrieve call
+RETRIEVE_CONCURRENCY = max(1, int(os.getenv("RETRIEVE_CONCURRENCY", "8")))
+
+# RAG knowledge_retrieval config, read from the environment once at import
+_RERANKER_ID = os.getenv('reranker_id')
+_KB_BASE = {
+    "similarity_threshold": 0.7,
+    "vector_similarity_weight": 0.5,
+    "top_k": 10,
+    "retrieve_type": "participle"
+}
+_KB_CONFIG_TEMPLATE = {
+    "merge_strategy": "weight",
+    "reranker_id": _RERANKER_ID,
+    "reranker_top_k": 10
+}
+
+
+async def _report_intermediate(ctx: Context, progress: int, total: int, intermediate: dict) -> None:
+    """
+    Push one per-question search result to the client as a progress notification.
+    
+    Only delivered when the client requested progress (sent a progressToken);
+    failures never affect the retrieval itself.
+    """
+    try:
+        await ctx.report_progress(
+            progress=progress,
+            total=total,
+            message=orjson.dumps(intermediate, default=str).decode(),
+        )
+    except Exception as e:
+        logger.debug(f"Retrieve: progress report failed: {e}")
+
 
 @mcp.tool()
 async def Retrieve(
@@ -51,55 +83,63 @@ async def Retrieve(
     Returns:
         dict: Contains 'context' with Query and Expansion_issue results
     """
-    kb_config = {
-        "knowledge_bases": [
-            {
-                "kb_id": user_rag_memory_id,
-                "similarity_threshold": 0.7,
-                "vector_similarity_weight": 0.5,
-                "top_k": 10,
-                "retrieve_type": "participle"
-            }
-        ],
-        "merge_strategy": "weight",
-        "reranker_id": os.getenv('reranker_id'),
-        "reranker_top_k": 10
+    # Only kb_id varies per call; knowledge_retrieval reads the config without mutating it
+    kb_config = _KB_CONFIG_TEMPLATE | {
+        "knowledge_bases": [{**_KB_BASE, "kb_id": user_rag_memory_id}]
     }
     start = time.time()
-    logger.info(f"Retrieve: storage_type={storage_type}, user_rag_memory_id={user_rag_memory_id}")
-    logger.info(f"Retrieve: context type={type(context)}, context={str(context)[:500]}")
+    logger.info("Retrieve: storage_type=%s, user_rag_memory_id=%s", storage_type, user_rag_memory_id)
+    # %.500s 在日志级别过滤后才做 str() 截断，DEBUG 关闭时不会序列化整个 context
+    logger.debug("Retrieve: context type=%s, context=%.500s", type(context), context)
     
     try:
         # Extract services from context
         search_service = get_context_resource(ctx, 'search_service')
         
-        databases_anser = []
-        
-        # Handle both dict and string context
+        # Normalize both input shapes to a list of questions, then run one retrieval path.
+        # A plain string context is a single query without expansions.
         if isinstance(context, dict):
             # Process dict context with extended questions
             all_items = []
-            logger.info(f"Retrieve: context keys={list(context.keys())}")
             content, original = await Retriev_messages_deal(context)
-            logger.info(f"Retrieve: after Retriev_messages_deal - content_type={type(content)}, content={str(content)[:300]}")
-            logger.info(f"Retrieve: original='{original[:100] if original else 'EMPTY'}'")
+            logger.debug(
+                "Retrieve: content_type=%s, content=%.300s, original='%.100s'",
+                type(content), content, original or 'EMPTY'
+            )
             
             if not original:
-                logger.warning(f"Retrieve: original query is empty! context={context}")
+                logger.warning("Retrieve: original query is empty! context=%.500s", context)
             
             # Extract all query items from content
             # content is like {original_question: [extended_questions...], ...}
-            for key, values in content.items():
-                if isinstance(values, list):
-                    all_items.extend(values)
-                elif isinstance(values, str):
-                    all_items.append(values)
-                elif values is not None:
-                    # Fallback: convert non-empty non-list values to string
-                    all_items.append(str(values))
-            
-            # Execute search for each question
-            for idx, question in enumerate(all_items):
+            for values in content.values():
+                match values:
+                    case list():
+                        all_items.extend(values)
+                    case str():
+                        all_items.append(values)
+                    case None:
+                        pass
+                    case _:
+                        # Fallback: convert non-empty non-list values to string
+                        all_items.append(str(values))
+        else:
+            original = str(context).strip()
+            all_items = [original] if original else []
+        
+        # Execute search for each question concurrently, bounded by RETRIEVE_CONCURRENCY
+        semaphore = asyncio.Semaphore(RETRIEVE_CONCURRENCY)
+        total = len(all_items)
+        use_rag = storage_type == "rag" and user_rag_memory_id
+
+        # Embed every question in one request up front; the per-question
+        # searches then reuse these vectors instead of each calling the embedder
+        query_embeddings = [None] * total if use_rag else await search_service.embed_questions(
+            all_items, memory_config=memory_config
+        )
+
+        async def _run_one(idx, question):
+            async with semaphore:
                 try:
                     # Prepare search parameters based on storage type
                     search_params = {
@@ -109,25 +149,29 @@ async def Retrieve(
                     }
 
                     # Add storage-specific parameters
-                    if storage_type == "rag" and user_rag_memory_id:
-                        retrieve_chunks_result = knowledge_retrieval(question, kb_config,[str(group_id)])
-                        try:
-                            retrieval_knowledge = [i.page_content for i in retrieve_chunks_result]
-                            clean_content = '\n\n'.join(retrieval_knowledge)
-                            cleaned_query=question
-                            raw_results=clean_content
-                            logger.info(f" Using RAG storage with memory_id={user_rag_memory_id}")
-                        except:
-                            clean_content = ''
-                            raw_results=''
-                            cleaned_query = question
-                            logger.info(f"No content retrieved from knowledge base: {user_rag_memory_id}")
+                    if use_rag:
+                        # knowledge_retrieval is synchronous; keep it off the event loop
+                        retrieve_chunks_result = await asyncio.to_thread(
+                            knowledge_retrieval, question, kb_config, [str(group_id)]
+                        )
+                        cleaned_query = question
+                        clean_content = ''
+                        if retrieve_chunks_result:
+                            try:
+                                clean_content = '\n\n'.join(i.page_content for i in retrieve_chunks_result)
+                                logger.info("Using RAG storage with memory_id=%s", user_rag_memory_id)
+                            except (AttributeError, TypeError):
+                                clean_content = ''
+                        if not clean_content:
+                            logger.info("No content retrieved from knowledge base: %s", user_rag_memory_id)
+                        raw_results = clean_content
                     else:
                         clean_content, cleaned_query, raw_results = await search_service.execute_hybrid_search(
-                            **search_params, memory_config=memory_config
+                            **search_params, memory_config=memory_config,
+                            query_embedding=query_embeddings[idx],
                         )
 
-                    databases_anser.append({
+                    return {
                         "Query_small": cleaned_query,
                         "Result_small": clean_content,
                         "_intermediate": {
@@ -135,118 +179,64 @@ async def Retrieve(
                             "query": cleaned_query,
                             "raw_results": raw_results,  
                             "index": idx + 1,
-                            "total": len(all_items)
+                            "total": total
                         }
-                    })
+                    }
                 except Exception as e:
                     logger.error(
                         f"Retrieve: hybrid_search failed for question '{question}': {e}",
                         exc_info=True
                     )
                     # Continue with empty result for this question
-                    databases_anser.append({
+                    return {
                         "Query_small": question,
                         "Result_small": ""
-                    })
-            
-            # Build initial database data structure
-            databases_data = {
-                "Query": original,
-                "Expansion_issue": databases_anser
-            }
-            
-            # Collect intermediate outputs before deduplication
-            intermediate_outputs = []
-            for item in databases_anser:
-                if '_intermediate' in item:
-                    intermediate_outputs.append(item['_intermediate'])
-            
-            # Deduplicate and merge results
-            deduplicated_data = deduplicate_entries(databases_data['Expansion_issue'])
-            deduplicated_data_merged = merge_to_key_value_pairs(
-                deduplicated_data,
-                'Query_small',
-                'Result_small'
-            )
-            
-            # Restructure for Verify/Retrieve_Summary compatibility
-            keys, val = [], []
-            for item in deduplicated_data_merged:
-                for items_key, items_value in item.items():
-                    keys.append(items_key)
-                    val.append(items_value)
-            
-            send_verify = []
-            for i, j in zip(keys, val, strict=False):
-                send_verify.append({
-                    "Query_small": i,
-                    "Answer_Small": j
-                })
-            
-            dup_databases = {
-                "Query": original,
-                "Expansion_issue": send_verify,
-                "_intermediate_outputs": intermediate_outputs  # Preserve intermediate outputs
-            }
-            
-            logger.info(f"Collected {len(intermediate_outputs)} intermediate outputs from search results")
-            
-        else:
-            # Handle string context (simple query)
-            query = str(context).strip()
-            
-            try:
-                # Prepare search parameters based on storage type
-                search_params = {
-                    "group_id": group_id,
-                    "question": query,
-                    "return_raw_results": True
-                }
-                
-                # Add storage-specific parameters
-                if storage_type == "rag" and user_rag_memory_id:
-                    retrieve_chunks_result = knowledge_retrieval(query, kb_config,[str(group_id)])
-                    try:
-                        retrieval_knowledge = [i.page_content for i in retrieve_chunks_result]
-                        clean_content = '\n\n'.join(retrieval_knowledge)
-                        cleaned_query = query
-                        raw_results = clean_content
-                        logger.info(f" Using RAG storage with memory_id={user_rag_memory_id}")
-                    except:
-                        clean_content = ''
-                        raw_results = ''
-                        cleaned_query = query
-                        logger.info(f"No content retrieved from knowledge base: {user_rag_memory_id}")
-                else:
-                    clean_content, cleaned_query, raw_results = await search_service.execute_hybrid_search(
-                        **search_params, memory_config=memory_config
-                    )
-                # Keep structure for Verify/Retrieve_Summary compatibility
-                dup_databases = {
-                    "Query": cleaned_query,
-                    "Expansion_issue": [{
-                        "Query_small": cleaned_query,
-                        "Answer_Small": clean_content,
-                        "_intermediate": {
-                            "type": "search_result",
-                            "query": cleaned_query,
-                            "raw_results": raw_results,
-                            "index": 1,
-                            "total": 1
-                        }
-                    }]
-                }
-            except Exception as e:
-                logger.error(
-                    f"Retrieve: hybrid_search failed for query '{query}': {e}",
-                    exc_info=True
-                )
-                # Return empty results on failure
-                dup_databases = {
-                    "Query": query,
-                    "Expansion_issue": []
-                }
-        
+                    }
+
+        async def _run_indexed(idx, question):
+            return idx, await _run_one(idx, question)
+
+        # Consume results as they complete so each intermediate output can be
+        # pushed to the client right away; results are re-ordered by index
+        # afterwards so they still line up with all_items.
+        results = [None] * total
+        done = 0
+        for next_done in asyncio.as_completed(
+            [_run_indexed(idx, question) for idx, question in enumerate(all_items)]
+        ):
+            idx, item = await next_done
+            results[idx] = item
+            done += 1
+            if '_intermediate' in item:
+                await _report_intermediate(ctx, done, total, item['_intermediate'])
+
+        # Restructure for Verify/Retrieve_Summary compatibility in one pass:
+        # collect intermediate outputs, drop duplicate (query, result) pairs
+        # and group results by query
+        intermediate_outputs = []
+        grouped = {}
+        seen = set()
+        for item in results:
+            if '_intermediate' in item:
+                intermediate_outputs.append(item['_intermediate'])
+            query_small, result_small = item['Query_small'], item['Result_small']
+            if (query_small, result_small) in seen:
+                continue
+            seen.add((query_small, result_small))
+            grouped.setdefault(query_small, []).append(result_small)
+        send_verify = [
+            {"Query_small": query_small, "Answer_Small": answers}
+            for query_small, answers in grouped.items()
+        ]
+
+        dup_databases = {
+            "Query": original,
+            "Expansion_issue": send_verify,
+            "_intermediate_outputs": intermediate_outputs  # Preserve intermediate outputs
+        }
+
+        logger.info(f"Collected {len(intermediate_outputs)} intermediate outputs from search results")
+
         logger.info(
             f"Retrieval: {storage_type}--{user_rag_memory_id}--Query={dup_databases.get('Query', '')}, "
             f"Expansion_issue count={len(dup_databases.get('Expansion_issue', []))}"
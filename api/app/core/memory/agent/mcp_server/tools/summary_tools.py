@@ -5,11 +5,12 @@ This module contains MCP tools for summarizing retrieved data and generating res
 LLM clients are constructed from MemoryConfig when needed.
 """
 
-import json
+import asyncio
 import os
 import re
 import time
 
+import orjson
 from app.core.logging_config import get_agent_logger, log_time
 from app.core.memory.agent.mcp_server.mcp_instance import mcp
 from app.core.memory.agent.mcp_server.models.summary_models import (
@@ -17,13 +18,12 @@ from app.core.memory.agent.mcp_server.models.summary_models import (
     SummaryResponse,
 )
 from app.core.memory.agent.mcp_server.server import get_context_resource
+from app.core.memory.agent.mcp_server.services.llm_client_service import get_llm_client
 from app.core.memory.agent.utils.messages_tool import (
     Resolve_username,
     Summary_messages_deal,
 )
-from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
 from app.core.rag.nlp.search import knowledge_retrieval
-from app.db import get_db_context
 from app.schemas.memory_config_schema import MemoryConfig
 from dotenv import load_dotenv
 from mcp.server.fastmcp import Context
@@ -66,10 +66,8 @@ async def Summary(
         template_service = get_context_resource(ctx, "template_service")
         session_service = get_context_resource(ctx, "session_service")
 
-        # Get LLM client from memory_config
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
+        # Get LLM client from memory_config (cached per configuration)
+        llm_client = await get_llm_client(memory_config)
         
         # Resolve session ID
         sessionid = Resolve_username(usermessages)
@@ -212,10 +210,8 @@ async def Retrieve_Summary(
         template_service = get_context_resource(ctx, "template_service")
         session_service = get_context_resource(ctx, "session_service")
 
-        # Get LLM client from memory_config
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
+        # Get LLM client from memory_config (cached per configuration)
+        llm_client = await get_llm_client(memory_config)
 
         # Resolve session ID
         sessionid = Resolve_username(usermessages)
@@ -231,15 +227,15 @@ async def Retrieve_Summary(
                 # If it's a JSON string, parse it
                 if isinstance(inner, str):
                     try:
-                        parsed = json.loads(inner)
+                        parsed = orjson.loads(inner)
                         logger.info("Retrieve_Summary: successfully parsed JSON")
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         # Try unescaping first
                         try:
                             unescaped = inner.encode('utf-8').decode('unicode_escape')
-                            parsed = json.loads(unescaped)
+                            parsed = orjson.loads(unescaped)
                             logger.info("Retrieve_Summary: parsed after unescaping")
-                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        except (orjson.JSONDecodeError, UnicodeDecodeError) as e:
                             logger.error(
                                 f"Retrieve_Summary: parsing failed even after unescape: {e}"
                             )
@@ -429,10 +425,8 @@ async def Input_Summary(
         session_service = get_context_resource(ctx, "session_service")
         search_service = get_context_resource(ctx, "search_service")
 
-        # Get LLM client from memory_config
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client_from_config(memory_config)
+        # Get LLM client from memory_config (cached per configuration)
+        llm_client = await get_llm_client(memory_config)
 
         # Resolve session ID
         sessionid = Resolve_username(usermessages) or ""
@@ -457,13 +451,12 @@ async def Input_Summary(
             # Try to parse as JSON first
             if isinstance(context, str) and (context.startswith('{') or context.startswith('[')):
                 try:
-                    import json
-                    context_dict = json.loads(context)
+                    context_dict = orjson.loads(context)
                     if isinstance(context_dict, dict):
                         query = context_dict.get('sentence', context_dict.get('content', context))
                     else:
                         query = context
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Not valid JSON, try regex
                     match = re.search(r"'sentence':\s*['\"]?(.*?)['\"]?\s*,", context)
                     query = match.group(1) if match else context
@@ -512,7 +505,10 @@ async def Input_Summary(
                         "reranker_top_k": 10
                     }
 
-                    retrieve_chunks_result = knowledge_retrieval(query, kb_config,[str(group_id)])
+                    # knowledge_retrieval is synchronous and opens its own DB session; run it off the event loop
+                    retrieve_chunks_result = await asyncio.to_thread(
+                        knowledge_retrieval, query, kb_config, [str(group_id)]
+                    )
                     try:
                         retrieval_knowledge = [i.page_content for i in retrieve_chunks_result]
                         retrieve_info = '\n\n'.join(retrieval_knowledge)
@@ -8,7 +8,6 @@ import time
 from app.core.logging_config import get_agent_logger, log_time
 from app.core.memory.agent.mcp_server.mcp_instance import mcp
 from app.core.memory.agent.mcp_server.server import get_context_resource
-from app.core.memory.agent.utils.llm_tools import PROJECT_ROOT_
 from app.core.memory.agent.utils.messages_tool import (
     Resolve_username,
     Retrieve_verify_tool_messages_deal,
@@ -16,7 +15,6 @@ from app.core.memory.agent.utils.messages_tool import (
 )
 from app.core.memory.agent.utils.verify_tool import VerifyTool
 from app.schemas.memory_config_schema import MemoryConfig
-from jinja2 import Template
 from mcp.server.fastmcp import Context
 
 logger = get_agent_logger(__name__)
@@ -55,15 +53,7 @@ async def Verify(
     try:
         # Extract services from context
         session_service = get_context_resource(ctx, 'session_service')
-        
-        # Load verification prompt template
-        file_path = PROJECT_ROOT_ + '/agent/utils/prompt/split_verify_prompt.jinja2'
-        
-        # Read template file directly (VerifyTool expects raw template content)
-        from app.core.memory.agent.utils.messages_tool import read_template_file
-        system_prompt = await read_template_file(file_path)
-
-
+        template_service = get_context_resource(ctx, 'template_service')
         
         # Resolve session ID
         sessionid = Resolve_username(usermessages)
@@ -71,8 +61,13 @@ async def Verify(
         # Get conversation history
         history = await session_service.get_history(sessionid, apply_id, group_id)
 
-        template = Template(system_prompt)
-        system_prompt = template.render(history=history, sentence=context)
+        # Render verification prompt from the shared (compiled-once) template
+        system_prompt = await template_service.render_template(
+            template_name='split_verify_prompt.jinja2',
+            operation_name='verify',
+            history=history,
+            sentence=context
+        )
         
         # Process context to extract query and results
         Query_small, Result_small, query = await Verify_messages_deal(context)
@@ -123,7 +118,7 @@ async def Verify(
                 "history": history,
             }
         
-        logger.info(f"Verification result: {messages_deal}")
+        logger.debug("Verification result: %s", messages_deal)
         
         # Emit intermediate output for frontend
         return {
@@ -0,0 +1,36 @@
+"""
+多模态上传/识别共用的 httpx.AsyncClient。
+
+同一事件循环内复用同一个连接池，重复请求同一主机时免去 TCP+TLS 握手。
+连接池绑定创建它的事件循环，因此客户端按当前运行的事件循环分别创建：
+Celery 任务在旧循环关闭后新建的循环会拿到新的客户端，不会复用已失效循环上的连接；
+循环被回收后对应条目随之释放。应用关闭时由 lifespan 调用 aclose_async_client() 关闭当前循环的客户端。
+"""
+import asyncio
+import weakref
+
+import httpx
+
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """获取当前事件循环共享的 AsyncClient（惰性创建，须在协程内调用）"""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=1000),
+            headers={"Connection": "keep-alive"},
+        )
+    return client
+
+
+async def aclose_async_client() -> None:
+    """关闭当前事件循环的共享 AsyncClient"""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
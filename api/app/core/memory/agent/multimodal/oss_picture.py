@@ -1,8 +1,10 @@
+import asyncio
+import mimetypes
 import os
 import sys
 import traceback
 
-import requests
+from app.core.memory.agent.multimodal._http import get_async_client
 
 # from qcloud_cos import CosConfig, CosS3Client
 # from qcloud_cos.cos_exception import CosClientError, CosServiceError
@@ -42,7 +44,7 @@ class OSSUploader:
         # 组合成完整的对象Key
         return f"{prefix}{filename}"
 
-    def upload_image(self, file_name, prefix='jd_'):
+    async def upload_image(self, file_name, prefix='jd_'):
         """
         上传文件到COS并返回可访问的URL
 
@@ -70,8 +72,9 @@ class OSSUploader:
         # 生成对象Key
         object_key = self._generate_object_key(file_path, prefix +file_name.split('.')[-1])
 
+        client = get_async_client()
         try:
-            upload_response = requests.post(
+            upload_response = await client.post(
                 self.api,
                 data={
                     "privacy": self.privacy,
@@ -85,18 +88,23 @@ class OSSUploader:
             name = resp["data"]["name"]
             file_url = resp["data"]["path"]
             policy = resp["data"]["policy"]
+            file_basename = os.path.basename(file_path)
+            content_type = mimetypes.guess_type(file_basename)[0] or "application/octet-stream"
             with open(file_path, 'rb') as f:
-                oss_push_resp = requests.post(
+                # 表单字段在前、文件在最后，与 OSS PostObject 要求一致
+                # 传入文件对象（而非 f.read() 的 bytes），httpx 按 64KB 分块流式发送，
+                # 不会把整个文件读入内存
+                oss_push_resp = await client.post(
                     policy["host"],
-                    files={
+                    data={
                         "key": policy["dir"],
                         "OSSAccessKeyId": policy["accessid"],
                         "name": name,
                         "policy": policy["policy"],
-                        "success_action_status": 200,
+                        "success_action_status": "200",
                         "signature": policy["signature"],
-                        "file": f,
-                    }
+                    },
+                    files={"file": (file_basename, f, content_type)},
                 )
                 if oss_push_resp.status_code == 200:
                     return file_url
@@ -110,5 +118,5 @@ class OSSUploader:
 
 if __name__ == '__main__':
     cos_uploader = OSSUploader("prod")
-    url =cos_uploader.upload_image('./example01.jpg')
+    url = asyncio.run(cos_uploader.upload_image('./example01.jpg'))
     print(url)
@@ -1,13 +1,35 @@
 import asyncio
-import re
 
+from app.core.memory.agent.multimodal._http import get_async_client
 from app.core.memory.agent.utils.llm_tools import PROJECT_ROOT_, picture_model_requests,Picture_recognize, Voice_recognize
 from app.core.memory.agent.utils.messages_tool import read_template_file
 
-import requests
 import json
 import os
-import time
+
+# 任务状态轮询退避：初始间隔、增长倍数、上限（秒）
+_POLL_INITIAL_DELAY = 0.1
+_POLL_BACKOFF = 1.5
+_POLL_MAX_DELAY = 2.0
+
+
+def _first_text(node):
+    """按 JSON 序列化顺序返回第一个字符串类型的 "text" 字段，直接遍历解析结果而不再序列化后正则匹配"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "text" and isinstance(value, str):
+                return value
+            found = _first_text(value)
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for item in node:
+            found = _first_text(item)
+            if found is not None:
+                return found
+    return None
+
+
 # file_urls = [
 #     "https://dashscope.oss-cn-beijing.aliyuncs.com/samples/audio/paraformer/hello_world_female2.wav",
 #     "https://dashscope.oss-cn-beijing.aliyuncs.com/samples/audio/paraformer/hello_world_male2.wav",
@@ -19,10 +41,12 @@ class Vico_recognition:
         self.api_base=''
         self.file_urls=file_urls
 
+    async def _load_credentials(self):
+        """每个转写任务只加载一次语音模型凭据，提交/轮询直接读取实例属性"""
+        self.api_key, self.backend_model_name, self.api_base = await Voice_recognize()
+
     # 提交文件转写任务，包含待转写文件url列表
     async  def submit_task(self) -> str:
-        self.api_key, self.backend_model_name, self.api_base =await Voice_recognize()
-
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -40,8 +64,8 @@ class Vico_recognition:
         service_url = (
             "https://dashscope.aliyuncs.com/api/v1/services/audio/asr/transcription"
         )
-        response = requests.post(
-            service_url, headers=headers, data=json.dumps(data)
+        response = await get_async_client().post(
+            service_url, headers=headers, content=json.dumps(data)
         )
 
         # 打印响应内容
@@ -60,7 +84,7 @@ class Vico_recognition:
             dict: 转写结果内容
         """
         try:
-            response = requests.get(transcription_url)
+            response = await get_async_client().get(transcription_url)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -69,50 +93,60 @@ class Vico_recognition:
 
     # 循环查询任务状态直到成功
     async def wait_for_complete(self,task_id):
-        self.api_key, self.backend_model_name, self.api_base = await Voice_recognize()
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "X-DashScope-Async": "enable",
         }
 
+        client = get_async_client()
+        # 查询任务状态服务url
+        service_url = f"https://dashscope.aliyuncs.com/api/v1/tasks/{task_id}"
+        delay = _POLL_INITIAL_DELAY
+        last_status = None
         pending = True
         while pending:
-            # 查询任务状态服务url
-            service_url = f"https://dashscope.aliyuncs.com/api/v1/tasks/{task_id}"
-            response = requests.post(
+            response = await client.post(
                 service_url, headers=headers
             )
             if response.status_code == 200:
                 status = response.json()['output']['task_status']
+                # 状态变化（如 PENDING -> RUNNING）后重新从最短间隔开始轮询
+                if status != last_status:
+                    delay = _POLL_INITIAL_DELAY
+                    last_status = status
                 if status == 'SUCCEEDED':
                     print("task succeeded!")
                     pending = False
                     return response.json()['output']['results']
                 elif status == 'RUNNING' or status == 'PENDING':
-                    pass
+                    # 非阻塞等待，按指数退避拉长轮询间隔
+                    await asyncio.sleep(delay)
+                    delay = min(delay * _POLL_BACKOFF, _POLL_MAX_DELAY)
                 else:
                     print("task failed!")
                     pending = False
             else:
                 print("query failed!")
                 pending = False
-            time.sleep(0.1)
     async def run(self):
-        self.api_key, self.backend_model_name, self.api_base = await Voice_recognize()
+        if not self.api_key:
+            await self._load_credentials()
         task_id=await self.submit_task()
         result=await self.wait_for_complete(task_id)
-        result_context=[]
-        for  i in result:
-            transcription_url=i['transcription_url']
+        # 各文件的转写结果相互独立，并发下载
+        transcription_urls = [i['transcription_url'] for i in result or []]
+        for transcription_url in transcription_urls:
             print(f"转写URL: {transcription_url}")
-
-            # 下载并打印转写内容
-            content = await self.download_transcription_result(transcription_url)
+        contents = await asyncio.gather(
+            *(self.download_transcription_result(url) for url in transcription_urls)
+        )
+        result_context=[]
+        for content in contents:
             if content:
-                content=json.dumps(content, indent=2, ensure_ascii=False)
-                context=re.findall(r'"text": "(.*?)"', content)
-                result_context.append(context[0])
+                context = _first_text(content)
+                if context:
+                    result_context.append(context)
         result=''.join(result_context)
         return (result)
 
@@ -1,10 +1,14 @@
 import asyncio
-import json
+import hashlib
 import logging
 import os
-from collections import defaultdict
+import re
+import weakref
+from functools import lru_cache
+from operator import itemgetter
 from typing import Annotated, TypedDict
 
+import orjson
 from app.core.memory.agent.utils.messages_tool import read_template_file
 from app.core.memory.utils.config.config_utils import (
     get_picture_config,
@@ -12,10 +16,11 @@ from app.core.memory.utils.config.config_utils import (
 )
 
 # Removed global variable imports - use dependency injection instead
+from cachetools import LRUCache
 from dotenv import load_dotenv
 from langchain_core.messages import AnyMessage
 from langgraph.graph import add_messages
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 PROJECT_ROOT_ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 logger = logging.getLogger(__name__)
@@ -23,6 +28,35 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+_PICTURE_PROMPT_PATH = PROJECT_ROOT_ + '/agent/utils/prompt/Template_for_image_recognition_prompt.jinja2'
+# 图片识别提示词为静态模板，首次使用时读取后复用
+_picture_prompt = None
+
+
+# 模型配置与环境变量在进程内基本不变：按模型名缓存解析结果，
+# 避免每次识别都扫描 CONFIG、触发 DeprecationWarning 并读取环境变量。
+# 配置查找失败会抛出异常，lru_cache 不缓存异常，下次调用会重新查找。
+@lru_cache(maxsize=8)
+def _picture_credentials(picture_model_name: str) -> tuple:
+    model_config = get_picture_config(picture_model_name)
+    # 从环境变量读取对应后端的 API key
+    return os.getenv(model_config["api_key"]), model_config["llm_name"].split("/")[-1], model_config['api_base']
+
+
+@lru_cache(maxsize=8)
+def _voice_credentials(voice_model_name: str) -> tuple:
+    model_config = get_voice_config(voice_model_name)
+    return os.getenv(model_config["api_key"]), model_config["llm_name"].split("/")[-1], model_config['api_base']
+
+
+def clear_model_config_cache():
+    '''
+    清空图片/语音模型配置缓存（修改配置或环境变量后调用）
+    '''
+    _picture_credentials.cache_clear()
+    _voice_credentials.cache_clear()
+
+
 async def picture_model_requests(image_url):
     '''
 
@@ -31,8 +65,10 @@ async def picture_model_requests(image_url):
     Returns:
 
     '''
-    file_path = PROJECT_ROOT_ + '/agent/utils/prompt/Template_for_image_recognition_prompt.jinja2 '
-    system_prompt = await read_template_file(file_path)
+    global _picture_prompt
+    if _picture_prompt is None:
+        _picture_prompt = await read_template_file(_PICTURE_PROMPT_PATH)
+    system_prompt = _picture_prompt
     result = await Picture_recognize(image_url,system_prompt)
     return (result)
 class WriteState(TypedDict):
@@ -54,6 +90,8 @@ class ReadState(TypedDict):
        search_switch：type
        config_id: configuration id for filtering results
        errors: list of errors that occurred during workflow execution
+       split_result: Verify 节点写入的校验结果（"success" / "failed"）
+       last_tool_call_id: 最近一次工具调用的 id
        '''
     messages: Annotated[list[AnyMessage], add_messages] #消息追加的模式增加消息
     name: str
@@ -65,6 +103,8 @@ class ReadState(TypedDict):
     group_id: str
     config_id: str
     errors: list[dict]  # Track errors: [{"tool": "tool_name", "error": "message"}]
+    split_result: str
+    last_tool_call_id: str
 
 
 class COUNTState:
@@ -94,21 +134,46 @@ class COUNTState:
 
 
 def merge_to_key_value_pairs(data, query_key, result_key):
-    grouped = defaultdict(list)
+    get_query, get_result = itemgetter(query_key), itemgetter(result_key)
+    grouped = {}
+    group = grouped.setdefault
     for item in data:
-        grouped[item[query_key]].append(item[result_key])
+        group(get_query(item), []).append(get_result(item))
     return [{key: values} for key, values in grouped.items()]
 
+_DEDUP_KEY = itemgetter('Query_small', 'Result_small')
+
+
 def deduplicate_entries(entries):
     seen = set()
-    deduped = []
-    for entry in entries:
-        key = (entry['Query_small'], entry['Result_small'])
-        if key not in seen:
-            seen.add(key)
-            deduped.append(entry)
-    return deduped
+    seen_add = seen.add
+    # seen_add 返回 None，首次出现的条目在同一表达式中登记并保留
+    return [e for e in entries if (k := _DEDUP_KEY(e)) not in seen and not seen_add(k)]
+
+
+
+# 去除模型回复中包裹 JSON 的 ```json ... ``` 代码围栏
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.M)
 
+# 复用 AsyncOpenAI 客户端及其连接池。连接池绑定创建它的事件循环，因此按当前运行的
+# 事件循环分别缓存（循环回收后随之释放）；每个循环内按 (api_base, api_key 摘要) 做 LRU，
+# 不以明文 key 作为缓存键，条目数有上限
+_ASYNC_OPENAI_CLIENTS_MAXSIZE = 16
+_async_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LRUCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_openai_client(api_base: str, api_key: str) -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    clients = _async_openai_clients.get(loop)
+    if clients is None:
+        clients = _async_openai_clients[loop] = LRUCache(maxsize=_ASYNC_OPENAI_CLIENTS_MAXSIZE)
+    key = (api_base, hashlib.sha256((api_key or "").encode()).hexdigest())
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = AsyncOpenAI(api_key=api_key, base_url=api_base)
+    return client
 
 
 async def Picture_recognize(image_path, PROMPT_TICKET_EXTRACTION, picture_model_name: str) -> str:
@@ -121,23 +186,17 @@ async def Picture_recognize(image_path, PROMPT_TICKET_EXTRACTION, picture_model_
         picture_model_name: Picture model name (required, no longer from global variables)
     """
     try:
-        model_config = get_picture_config(picture_model_name)
+        api_key, backend_model_name, api_base = _picture_credentials(picture_model_name)
     except Exception as e:
             err = f"LLM配置不可用：{str(e)}。请检查 config.json 和 runtime.json。"
             logger.error(err)
             return err
-    api_key = os.getenv(model_config["api_key"])  # 从环境变量读取对应后端的 API key
-    backend_model_name = model_config["llm_name"].split("/")[-1]
-    api_base=model_config['api_base']
-
-    logger.info(f"model_name: {backend_model_name}")
-    logger.info(f"api_key set: {'yes' if api_key else 'no'}")
-    logger.info(f"base_url: {model_config['api_base']}")
-
-    client = OpenAI(
-        api_key=api_key, base_url=api_base,
-    )
-    completion = client.chat.completions.create(
+
+    logger.debug("model_name: %s, api_key set: %s, base_url: %s",
+                 backend_model_name, 'yes' if api_key else 'no', api_base)
+
+    client = _get_async_openai_client(api_base, api_key)
+    completion = await client.chat.completions.create(
         model=backend_model_name,
         messages=[
                 {
@@ -153,8 +212,7 @@ async def Picture_recognize(image_path, PROMPT_TICKET_EXTRACTION, picture_model_
                 }
             ])
     picture_text = completion.choices[0].message.content
-    picture_text = picture_text.replace('```json', '').replace('```', '')
-    picture_text = json.loads(picture_text)
+    picture_text = orjson.loads(_FENCE_RE.sub('', picture_text).strip())
     return (picture_text['statement'])
 
 async def Voice_recognize(voice_model_name: str):
@@ -165,14 +223,10 @@ async def Voice_recognize(voice_model_name: str):
         voice_model_name: Voice model name (required, no longer from global variables)
     """
     try:
-        model_config = get_voice_config(voice_model_name)
+        return _voice_credentials(voice_model_name)
     except Exception as e:
             err = f"LLM配置不可用：{str(e)}。请检查 config.json 和 runtime.json。"
             logger.error(err)
             return err
-    api_key = os.getenv(model_config["api_key"])  # 从环境变量读取对应后端的 API key
-    backend_model_name = model_config["llm_name"].split("/")[-1]
-    api_base = model_config['api_base']
-    return api_key,backend_model_name,api_base
 
 
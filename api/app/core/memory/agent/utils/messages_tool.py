@@ -1,13 +1,24 @@
-import json
 import logging
 import re
 from typing import Any, List
 
+import orjson
 from app.core.logging_config import get_agent_logger
 from langchain_core.messages import AnyMessage
 
 logger = get_agent_logger(__name__)
 
+# Single-value extractors: search() stops at the first match instead of collecting all of them
+_SUMMARY_QUERY_RE = re.compile(r'"query": (.*?),')
+_VERIFY_QUERY_RE = re.compile(r'"Query": "(.*?)"')
+# Patterns run on every Summary / Verify tool call, compiled once at import
+_ANSWER_SMALL_LIST_RE = re.compile(r'"answer_small"\s*:\s*"(\[.*?\])"')
+_BRACE_BLOCK_RE = re.compile(r'\{(.*?)\}', re.S)
+_BLOCK_QUERY_SMALL_RE = re.compile(r'"Query_small"\s*:\s*"([^"]*)"')
+_BLOCK_ANSWER_SMALL_RE = re.compile(r'"Answer_Small"\s*:\s*(\[[^\]]*\])')
+_BLOCK_STATUS_RE = re.compile(r'"status"\s*:\s*"([^"]*)"')
+_BLOCK_QUERY_ANSWER_RE = re.compile(r'"Query_answer"\s*:\s*"([^"]*)"')
+
 
 def _to_openai_messages(msgs: List[AnyMessage]) -> List[dict]:
     out = []
@@ -126,8 +137,8 @@ async def Problem_Extension_messages_deal(context):
     
     if isinstance(messages, str):
         try:
-            messages = json.loads(messages)
-        except json.JSONDecodeError:
+            messages = orjson.loads(messages)
+        except orjson.JSONDecodeError:
             # If JSON parsing fails, return empty list
             return extent_quest, original
     
@@ -147,14 +158,16 @@ async def Retriev_messages_deal(context):
         context:
     Returns:
     '''
-    logger.info(f"Retriev_messages_deal input: type={type(context)}, value={str(context)[:500]}")
+    logger.debug("Retriev_messages_deal input: type=%s, value=%.500s", type(context), context)
     
     if isinstance(context, dict):
-        logger.info(f"Retriev_messages_deal: context is dict with keys={list(context.keys())}")
         if 'context' in context or 'original' in context:
             content = context.get('context', {})
             original = context.get('original', '')
-            logger.info(f"Retriev_messages_deal output: content_type={type(content)}, content={str(content)[:300]}, original='{original[:50] if original else ''}'")
+            logger.debug(
+                "Retriev_messages_deal output: content_type=%s, content=%.300s, original='%.50s'",
+                type(content), content, original or ''
+            )
             return content, original
     
     # Return empty defaults if context is not a dict or doesn't have expected keys
@@ -187,13 +200,14 @@ async def Summary_messages_deal(context):
     Returns:
     '''
     messages = str(context).replace('\\n', '').replace('\n', '').replace('\\', '')
-    query = re.findall(r'"query": (.*?),', messages)[0]
+    query_match = _SUMMARY_QUERY_RE.search(messages)
+    query = query_match.group(1) if query_match else ""
     query = query.replace('[', '').replace(']', '').strip()
-    matches = re.findall(r'"answer_small"\s*:\s*"(\[.*?\])"', messages)
+    matches = _ANSWER_SMALL_LIST_RE.findall(messages)
     answer_small_texts = []
     for m in matches:
         try:
-            parsed = json.loads(m)
+            parsed = orjson.loads(m)
             for item in parsed:
                 answer_small_texts.append(item.strip().replace('\\', '').replace('[', '').replace(']', ''))
         except Exception:
@@ -212,7 +226,8 @@ async def VerifyTool_messages_deal(context):
     messages = str(context).replace('\\n', '').replace('\n', '').replace('\\', '')
     content_messages = messages.split('"context":')[1].replace('""', '"')
     messages = str(content_messages).split("name='Retrieve'")[0]
-    query = re.findall('"Query": "(.*?)"', messages)[0]
+    query_match = _VERIFY_QUERY_RE.search(messages)
+    query = query_match.group(1) if query_match else ""
     Query_small = re.findall('"Query_small": "(.*?)"', messages)
     Result_small = re.findall('"Result_small": "(.*?)"', messages)
     return Query_small, Result_small, query
@@ -232,12 +247,12 @@ async def Retrieve_verify_tool_messages_deal(context, history, query):
     results = []
     # 统一转为字符串，避免 None 或非字符串导致正则报错
     text = str(context)
-    blocks = re.findall(r'\{(.*?)\}', text, flags=re.S)
+    blocks = _BRACE_BLOCK_RE.findall(text)
     for block in blocks:
-        query_small = re.search(r'"Query_small"\s*:\s*"([^"]*)"', block)
-        answer_small = re.search(r'"Answer_Small"\s*:\s*(\[[^\]]*\])', block)
-        status = re.search(r'"status"\s*:\s*"([^"]*)"', block)
-        query_answer = re.search(r'"Query_answer"\s*:\s*"([^"]*)"', block)
+        query_small = _BLOCK_QUERY_SMALL_RE.search(block)
+        answer_small = _BLOCK_ANSWER_SMALL_RE.search(block)
+        status = _BLOCK_STATUS_RE.search(block)
+        query_answer = _BLOCK_QUERY_ANSWER_RE.search(block)
 
         results.append({
             "query_small": query_small.group(1) if query_small else None,
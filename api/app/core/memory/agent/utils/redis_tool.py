@@ -1,8 +1,27 @@
+import hashlib
+import os
+
+import orjson
 import redis
 import uuid
 from datetime import datetime
 from app.core.config import settings
 
+# 二级索引：按 apply_id+group_id、按 sessionid 记录会话 ID，避免 KEYS session:* 全量扫描
+# 所有索引 key 统一放在 idx:session: 命名空间下，清理时只扫描该前缀
+_INDEX_PREFIX = "idx:session:"
+# apply_id+group_id 索引为 ZSET，score 为写入时间戳，可直接按时间倒序取最新会话
+_APPLY_GROUP_INDEX = _INDEX_PREFIX + "ag:{apply_id}:{group_id}"
+_SESSIONID_INDEX = _INDEX_PREFIX + "sid:{userid}"
+# 标记索引已由历史数据回填完成
+_INDEX_BUILT_KEY = _INDEX_PREFIX + "built"
+_SCAN_COUNT = 1000
+_STARTTIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# find_user_apply_group 返回的最新会话条数
+_RECENT_LIMIT = 6
+# 判定重复会话的字段
+_DEDUP_FIELDS = ("sessionid", "id", "group_id", "messages", "aimessages")
+
 
 class RedisSessionStore:
     def __init__(self, host='localhost', port=6379, db=0, password=None, session_id=''):
@@ -15,11 +34,16 @@ class RedisSessionStore:
             encoding='utf-8'
         )
         self.uudi = session_id
+        self._indexes_ready = False
 
     def _fix_encoding(self, text):
         """修复错误编码的文本"""
         if not text or not isinstance(text, str):
             return text
+        # 纯 ASCII 往返后不变；含 Latin-1 以外字符（如中文）无法按 Latin-1 编码，修复必然失败。
+        # 这两种常见情况直接返回，不走 encode/decode 与异常处理
+        if text.isascii() or max(text) > '\xff':
+            return text
         try:
             # 尝试修复 Latin-1 误编码为 UTF-8 的情况
             return text.encode('latin-1').decode('utf-8')
@@ -27,6 +51,139 @@ class RedisSessionStore:
             # 如果修复失败，返回原文本
             return text
 
+    @staticmethod
+    def _apply_group_index_key(apply_id, group_id):
+        return _APPLY_GROUP_INDEX.format(apply_id=apply_id, group_id=group_id)
+
+    @staticmethod
+    def _sessionid_index_key(userid):
+        return _SESSIONID_INDEX.format(userid=userid)
+
+    @staticmethod
+    def _starttime_score(starttime):
+        """starttime 字符串转时间戳，作为 ZSET score"""
+        try:
+            return datetime.strptime(starttime, _STARTTIME_FORMAT).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _index_session(self, pipe, session_id, userid, apply_id, group_id, score):
+        """在 pipeline 中登记会话的二级索引"""
+        pipe.zadd(self._apply_group_index_key(apply_id, group_id), {session_id: score})
+        pipe.sadd(self._sessionid_index_key(userid), session_id)
+
+    def _unindex_session(self, pipe, session_id, data):
+        """在 pipeline 中移除会话的二级索引"""
+        pipe.zrem(self._apply_group_index_key(data.get('apply_id'), data.get('group_id')), session_id)
+        pipe.srem(self._sessionid_index_key(data.get('sessionid')), session_id)
+
+    @staticmethod
+    def _pack_session(data):
+        """
+        会话整体序列化为一个字符串值（SET），读取时一次 MGET 即可；
+        字段值与原 hash 写入保持一致：非字符串按 str() 存储，None 与 HSET 一样拒绝写入
+        """
+        packed = {}
+        for k, v in data.items():
+            if v is None:
+                raise redis.DataError(
+                    f"Invalid input of type: 'NoneType' for field '{k}'. "
+                    "Convert to a bytes, string, int or float first."
+                )
+            packed[k] = v if isinstance(v, str) else str(v)
+        return orjson.dumps(packed).decode()
+
+    def _load_sessions(self, keys):
+        """
+        批量读取会话，返回与 keys 对齐的列表（不存在为 None）
+        新数据为字符串值，MGET 一次取回；旧版 hash 数据 MGET 返回 None，回退到 HGETALL
+        """
+        sessions = []
+        for i in range(0, len(keys), _SCAN_COUNT):
+            batch = keys[i:i + _SCAN_COUNT]
+            loaded = [orjson.loads(v) if v else None for v in self.r.mget(batch)]
+            legacy = [j for j, data in enumerate(loaded) if data is None]
+            if legacy:
+                pipe = self.r.pipeline()
+                for j in legacy:
+                    pipe.hgetall(batch[j])
+                for j, data in zip(legacy, pipe.execute(), strict=False):
+                    loaded[j] = data or None
+            sessions.extend(loaded)
+        return sessions
+
+    def _scan_session_keys(self):
+        """以 SCAN 分批遍历会话 key，不会像 KEYS 一样阻塞 Redis"""
+        return self.r.scan_iter(match='session:*', count=_SCAN_COUNT)
+
+    def _ensure_indexes(self):
+        """
+        首次使用索引前回填历史会话的索引（每个 Redis 库只做一次）
+        """
+        if self._indexes_ready:
+            return
+        if not self.r.exists(_INDEX_BUILT_KEY):
+            keys = list(self._scan_session_keys())
+            pipe = self.r.pipeline()
+            for key, data in zip(keys, self._load_sessions(keys), strict=False):
+                if not data:
+                    continue
+                self._index_session(
+                    pipe, key.split(':', 1)[1], data.get('sessionid'), data.get('apply_id'), data.get('group_id'),
+                    self._starttime_score(data.get('starttime'))
+                )
+            pipe.set(_INDEX_BUILT_KEY, 1)
+            pipe.execute()
+        self._indexes_ready = True
+
+    def _load_indexed(self, session_ids):
+        """读取一组会话 ID，返回 (存在的会话列表, 已失效的 ID 列表)"""
+        if not session_ids:
+            return [], []
+        sessions = []
+        stale_ids = []
+        all_data = self._load_sessions([f"session:{sid}" for sid in session_ids])
+        for sid, data in zip(session_ids, all_data, strict=False):
+            if data:
+                sessions.append(data)
+            else:
+                stale_ids.append(sid)
+        return sessions, stale_ids
+
+    def _get_indexed_sessions(self, index_key):
+        """
+        读取 sessionid 索引（SET）中的会话；已不存在的会话顺带从索引清除
+        """
+        self._ensure_indexes()
+        sessions, stale_ids = self._load_indexed(list(self.r.smembers(index_key)))
+        if stale_ids:
+            self.r.srem(index_key, *stale_ids)
+        return sessions
+
+    def _iter_group_sessions(self, apply_id, group_id, page_size=_SCAN_COUNT):
+        """
+        按写入时间倒序分页遍历 apply_id+group_id 下的会话（ZREVRANGE），
+        遍历结束后把已不存在的会话从索引清除
+        """
+        self._ensure_indexes()
+        index_key = self._apply_group_index_key(apply_id, group_id)
+        stale_ids = []
+        start = 0
+        try:
+            while True:
+                session_ids = self.r.zrevrange(index_key, start, start + page_size - 1)
+                if not session_ids:
+                    break
+                sessions, stale = self._load_indexed(session_ids)
+                stale_ids.extend(stale)
+                yield from sessions
+                if len(session_ids) < page_size:
+                    break
+                start += page_size
+        finally:
+            if stale_ids:
+                self.r.zrem(index_key, *stale_ids)
+
     # 修改后的 save_session 方法
     def save_session(self, userid, messages, aimessages, apply_id, group_id):
         """
@@ -35,14 +192,15 @@ class RedisSessionStore:
         """
         try:
             session_id = str(uuid.uuid4())  # 为每次会话生成新的 ID
-            starttime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            now = datetime.now()
+            starttime = now.strftime(_STARTTIME_FORMAT)
             key = f"session:{session_id}"  # 使用新生成的 session_id 作为 key
 
             # 使用 pipeline 批量写入，减少网络往返
             pipe = self.r.pipeline()
 
-            # 直接写入数据，decode_responses=True 已经处理了编码
-            pipe.hset(key, mapping={
+            # 整条会话序列化为单个字符串值写入
+            pipe.set(key, self._pack_session({
                 "id": self.uudi,
                 "sessionid": userid,
                 "apply_id": apply_id,
@@ -50,7 +208,9 @@ class RedisSessionStore:
                 "messages": messages,
                 "aimessages": aimessages,
                 "starttime": starttime
-            })
+            }))
+
+            self._index_session(pipe, session_id, userid, apply_id, group_id, now.timestamp())
 
             # 可选：设置过期时间（例如30天），避免数据无限增长
             # pipe.expire(key, 30 * 24 * 60 * 60)
@@ -72,27 +232,39 @@ class RedisSessionStore:
         """
         try:
             session_ids = []
-            pipe = self.r.pipeline()
+            # 同一批次共用一个写入时间，不在循环内逐条格式化
+            now = datetime.now()
+            starttime = now.strftime(_STARTTIME_FORMAT)
+            score = now.timestamp()
+
+            # 按 _SCAN_COUNT 条分批提交，避免一次性缓冲全部命令；
+            # 批量写入无需 MULTI/EXEC，transaction=False 让其他客户端的命令可以穿插执行
+            for i in range(0, len(sessions_data), _SCAN_COUNT):
+                pipe = self.r.pipeline(transaction=False)
+                chunk = sessions_data[i:i + _SCAN_COUNT]
+                # 整批随机字节一次取出，再逐条切片成 UUID4（格式与 uuid.uuid4() 一致）
+                raw = os.urandom(16 * len(chunk))
+                for j, session in enumerate(chunk):
+                    session_id = str(uuid.UUID(bytes=raw[j * 16:(j + 1) * 16], version=4))
+                    key = f"session:{session_id}"
+
+                    pipe.set(key, self._pack_session({
+                        "id": self.uudi,
+                        "sessionid": session.get('userid'),
+                        "apply_id": session.get('apply_id'),
+                        "group_id": session.get('group_id'),
+                        "messages": session.get('messages'),
+                        "aimessages": session.get('aimessages'),
+                        "starttime": starttime
+                    }))
+                    self._index_session(
+                        pipe, session_id, session.get('userid'), session.get('apply_id'), session.get('group_id'),
+                        score
+                    )
+
+                    session_ids.append(session_id)
+                pipe.execute()
 
-            for session in sessions_data:
-                session_id = str(uuid.uuid4())
-                starttime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                key = f"session:{session_id}"
-
-                pipe.hset(key, mapping={
-                    "id": self.uudi,
-                    "sessionid": session.get('userid'),
-                    "apply_id": session.get('apply_id'),
-                    "group_id": session.get('group_id'),
-                    "messages": session.get('messages'),
-                    "aimessages": session.get('aimessages'),
-                    "starttime": starttime
-                })
-
-                session_ids.append(session_id)
-
-            # 一次性执行所有写入操作
-            results = pipe.execute()
             print(f"批量保存完成: {len(session_ids)} 条记录")
             return session_ids
         except Exception as e:
@@ -105,8 +277,7 @@ class RedisSessionStore:
         读取一条会话数据
         """
         key = f"session:{session_id}"
-        data = self.r.hgetall(key)
-        return data if data else None
+        return self._load_sessions([key])[0]
 
     def get_session_apply_group(self, sessionid, apply_id, group_id):
         """
@@ -114,13 +285,8 @@ class RedisSessionStore:
         """
         result_items = []
 
-        # 遍历所有会话数据
-        for key in self.r.keys('session:*'):
-            data = self.r.hgetall(key)
-
-            if not data:
-                continue
-
+        # 只读取同一 apply_id+group_id 索引下的会话（按时间倒序）
+        for data in self._iter_group_sessions(apply_id, group_id):
             # 检查三个条件是否都匹配
             if (data.get('sessionid') == sessionid and
                     data.get('apply_id') == apply_id and
@@ -133,24 +299,46 @@ class RedisSessionStore:
         """
         获取所有会话数据
         """
-        sessions = {}
-        for key in self.r.keys('session:*'):
-            sid = key.split(':')[1]
-            sessions[sid] = self.get_session(sid)
-        return sessions
+        keys = list(self._scan_session_keys())
+        return {
+            key.split(':')[1]: data
+            for key, data in zip(keys, self._load_sessions(keys), strict=False)
+        }
 
     # ---------------- 更新 ----------------
     def update_session(self, session_id, field, value):
         """
         更新单个字段
-        优化版本：使用 pipeline 减少网络往返
+        字符串值需整体读改写，使用 WATCH/MULTI 保证并发更新不同字段时不会互相覆盖
         """
         key = f"session:{session_id}"
-        pipe = self.r.pipeline()
-        pipe.exists(key)
-        pipe.hset(key, field, value)
-        results = pipe.execute()
-        return bool(results[0])  # 返回 key 是否存在
+
+        def _update(pipe):
+            # WATCH 之后的命令立即执行；MGET 对旧版 hash 返回 None 而不是 WRONGTYPE 错误
+            raw = pipe.mget([key])[0]
+            if raw:
+                old_data, legacy = orjson.loads(raw), False
+            else:
+                old_data = pipe.hgetall(key) or None
+                legacy = old_data is not None
+            pipe.multi()
+            if legacy:
+                # 旧版 hash 数据直接更新字段
+                pipe.hset(key, field, value)
+            else:
+                pipe.set(key, self._pack_session({**(old_data or {}), field: value}))
+            if old_data and field in ('sessionid', 'apply_id', 'group_id'):
+                # 索引字段变更时需要同步迁移索引
+                self._unindex_session(pipe, session_id, old_data)
+                new_data = {**old_data, field: value}
+                self._index_session(
+                    pipe, session_id, new_data.get('sessionid'), new_data.get('apply_id'), new_data.get('group_id'),
+                    self._starttime_score(new_data.get('starttime'))
+                )
+            return old_data is not None  # 返回 key 是否存在
+
+        # 期间 key 被其他客户端修改时 EXEC 失败（WatchError），transaction() 会自动重试
+        return self.r.transaction(_update, key, value_from_callable=True)
 
     # ---------------- 删除 ----------------
     def delete_session(self, session_id):
@@ -158,16 +346,33 @@ class RedisSessionStore:
         删除单条会话
         """
         key = f"session:{session_id}"
-        return self.r.delete(key)
+        data = self._load_sessions([key])[0]
+        if not data:
+            return 0
+        pipe = self.r.pipeline()
+        pipe.delete(key)
+        self._unindex_session(pipe, session_id, data)
+        return pipe.execute()[0]
 
     def delete_all_sessions(self):
         """
         删除所有会话
         """
-        keys = self.r.keys('session:*')
-        if keys:
-            return self.r.delete(*keys)
-        return 0
+        deleted = 0
+        batch = []
+        for key in self._scan_session_keys():
+            batch.append(key)
+            if len(batch) >= _SCAN_COUNT:
+                deleted += self.r.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self.r.delete(*batch)
+        # 会话已全部删除，索引一并清空
+        index_keys = list(self.r.scan_iter(match=_INDEX_PREFIX + '*', count=_SCAN_COUNT))
+        if index_keys:
+            self.r.delete(*index_keys)
+        self._indexes_ready = False
+        return deleted
 
     def delete_duplicate_sessions(self):
         """
@@ -178,43 +383,33 @@ class RedisSessionStore:
         import time
         start_time = time.time()
 
-        # 第一步：使用 pipeline 批量获取所有 key
-        keys = self.r.keys('session:*')
+        # 第一步：使用 SCAN 分批获取所有 key
+        keys = list(self._scan_session_keys())
 
         if not keys:
             print("[delete_duplicate_sessions] 没有会话数据")
             return 0
 
-        # 第二步：使用 pipeline 批量获取所有数据
-        pipe = self.r.pipeline()
-        for key in keys:
-            pipe.hgetall(key)
-        all_data = pipe.execute()
+        # 第二步：MGET 批量获取所有数据
+        all_data = self._load_sessions(keys)
 
         # 第三步：在内存中识别重复数据
-        seen = {}  # 用字典记录：identifier -> key（保留第一个出现的 key）
+        seen = set()  # 已出现的会话指纹（保留第一个出现的 key）
         keys_to_delete = []  # 需要删除的 key 列表
 
         for key, data in zip(keys, all_data, strict=False):
             if not data:
                 continue
 
-            # 获取五个字段的值
-            sessionid = data.get('sessionid', '')
-            user_id = data.get('id', '')
-            group_id = data.get('group_id', '')
-            messages = data.get('messages', '')
-            aimessages = data.get('aimessages', '')
-
-            # 用五元组作为唯一标识
-            identifier = (sessionid, user_id, group_id, messages, aimessages)
+            # 五个字段的 16 字节摘要作为唯一标识，不在内存中保留完整消息文本
+            identifier = self._session_fingerprint(data)
 
             if identifier in seen:
                 # 重复，标记为待删除
-                keys_to_delete.append(key)
+                keys_to_delete.append((key, data))
             else:
                 # 第一次出现，记录
-                seen[identifier] = key
+                seen.add(identifier)
 
         # 第四步：使用 pipeline 批量删除重复的 key
         deleted_count = 0
@@ -224,8 +419,9 @@ class RedisSessionStore:
             for i in range(0, len(keys_to_delete), batch_size):
                 batch = keys_to_delete[i:i + batch_size]
                 pipe = self.r.pipeline()
-                for key in batch:
+                for key, data in batch:
                     pipe.delete(key)
+                    self._unindex_session(pipe, key.split(':', 1)[1], data)
                 pipe.execute()
                 deleted_count += len(batch)
 
@@ -233,11 +429,25 @@ class RedisSessionStore:
         print(f"[delete_duplicate_sessions] 删除重复会话数量: {deleted_count}, 耗时: {elapsed_time:.3f}秒")
         return deleted_count
 
+    @staticmethod
+    def _session_fingerprint(data):
+        """
+        "sessionid"、"id"、"group_id"、"messages"、"aimessages" 五个字段的 blake2b-128 摘要
+        每个字段带长度前缀，避免不同切分拼出相同字节串
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for field in _DEDUP_FIELDS:
+            value = data.get(field, '')
+            raw = ('' if value is None else str(value)).encode('utf-8', 'surrogatepass')
+            h.update(len(raw).to_bytes(8, 'little'))
+            h.update(raw)
+        return h.digest()
+
     def find_user_session(self, sessionid):
         user_id = sessionid
 
         result_items = []
-        for key, values in store.get_all_sessions().items():
+        for values in self._get_indexed_sessions(self._sessionid_index_key(user_id)):
             history = {}
             if user_id == str(values['sessionid']):
                 history["Query"] = values['messages']
@@ -254,43 +464,21 @@ class RedisSessionStore:
         """
         import time
         start_time = time.time()
-        # 使用 pipeline 批量获取数据，提高性能
-        keys = self.r.keys('session:*')
-
-        if not keys:
-            print(f"查询耗时: {time.time() - start_time:.3f}秒, 结果数: 0")
-            return []
-
-        # 使用 pipeline 批量获取所有 hash 数据
-        pipe = self.r.pipeline()
-        for key in keys:
-            pipe.hgetall(key)
-        all_data = pipe.execute()
-
-        # 解析并筛选符合条件的数据
-        matched_items = []
-        for data in all_data:
-            if not data:
-                continue
-
+        # 按时间倒序遍历同一 apply_id+group_id 下的会话，凑满最新的6条即停止
+        # （sessionid 仍需模糊匹配，在内存中筛选）
+        result_items = []
+        for data in self._iter_group_sessions(apply_id, group_id, page_size=_RECENT_LIMIT * 4):
             # 检查是否符合三个条件
-
             if (data.get('apply_id') == apply_id and
                     data.get('group_id') == group_id):
                 # 支持模糊匹配 sessionid 或者完全匹配
                 if sessionid in data.get('sessionid', '') or data.get('sessionid') == sessionid:
-                    matched_items.append({
+                    result_items.append({
                         "Query": self._fix_encoding(data.get('messages')),
                         "Answer": self._fix_encoding(data.get('aimessages')),
-                        "starttime": data.get('starttime', '')
                     })
-        # 按时间降序排序（最新的在前）
-        matched_items.sort(key=lambda x: x.get('starttime', ''), reverse=True)
-        # 只保留最新的6条
-        result_items = matched_items[:6]
-        # # 移除 starttime 字段
-        for item in result_items:
-            item.pop('starttime', None)
+                    if len(result_items) >= _RECENT_LIMIT:
+                        break
 
         # 如果结果少于等于1条，返回空列表
         if len(result_items) <= 1:
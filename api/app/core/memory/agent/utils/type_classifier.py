@@ -1,12 +1,13 @@
 """
 Type classification utility for distinguishing read/write operations.
 """
+import asyncio
+from functools import cache
+
 from app.core.config import settings
 from app.core.logging_config import get_agent_logger, log_prompt_rendering
+from app.core.memory.agent.mcp_server.services.llm_client_service import build_llm_client_by_model_id
 from app.core.memory.agent.utils.llm_tools import PROJECT_ROOT_
-from app.core.memory.agent.utils.messages_tool import read_template_file
-from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
-from app.db import get_db_context
 from jinja2 import Template
 from pydantic import BaseModel
 
@@ -18,6 +19,22 @@ class DistinguishTypeResponse(BaseModel):
     type: str
 
 
+_DISTINGUISH_TYPES_PROMPT_PATH = PROJECT_ROOT_ + '/agent/utils/prompt/distinguish_types_prompt.jinja2'
+
+
+@cache
+def _get_compiled_template(path: str) -> Template:
+    """
+    Read and compile a prompt template once per process.
+
+    Prompt templates ship with the code, so the compiled template is kept for
+    the lifetime of the process and the file is not re-read or re-stat'ed.
+    A failed read/compile raises and is not cached.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+
 async def status_typle(messages: str, llm_model_id: str) -> dict:
     """
     Classify message type as read or write operation.
@@ -31,9 +48,7 @@ async def status_typle(messages: str, llm_model_id: str) -> dict:
         dict: Contains 'type' field with classification result
     """
     try:
-        file_path = PROJECT_ROOT_ + '/agent/utils/prompt/distinguish_types_prompt.jinja2'
-        template_content = await read_template_file(file_path)
-        template = Template(template_content)
+        template = _get_compiled_template(_DISTINGUISH_TYPES_PROMPT_PATH)
         system_prompt = template.render(user_query=messages)
         log_prompt_rendering("status_typle", system_prompt)
     except Exception as e:
@@ -43,9 +58,8 @@ async def status_typle(messages: str, llm_model_id: str) -> dict:
             "message": f"Prompt rendering failed: {str(e)}"
         }
     
-    with get_db_context() as db:
-        factory = MemoryClientFactory(db)
-        llm_client = factory.get_llm_client(llm_model_id)
+    # 同步 DB 查询放到线程池执行，避免阻塞事件循环
+    llm_client = await asyncio.to_thread(build_llm_client_by_model_id, llm_model_id)
 
     try:
         structured = await llm_client.response_structured(
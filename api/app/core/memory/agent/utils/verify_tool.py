@@ -1,14 +1,15 @@
 import asyncio
-import json
 import os
+from functools import cached_property
 from typing import Annotated, Any, List, TypedDict
 
+import orjson
+
 # Removed global variable imports - use dependency injection instead
 from app.core.logging_config import get_agent_logger
+from app.core.memory.agent.mcp_server.services.llm_client_service import build_llm_client_by_model_id
 from app.core.memory.agent.utils.llm_tools import PROJECT_ROOT_
 from app.core.memory.agent.utils.messages_tool import _to_openai_messages
-from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
-from app.db import get_db_context
 from dotenv import find_dotenv, load_dotenv
 from jinja2 import Environment, FileSystemLoader
 from langchain_core.messages import AnyMessage, HumanMessage
@@ -43,20 +44,23 @@ class VerifyTool:
         """
         self.system_prompt = system_prompt
         self.llm_model_id = llm_model_id
-        if isinstance(verify_data, str):
-            self.verify_data = verify_data
-        else:
-            try:
-                self.verify_data = json.dumps(verify_data, ensure_ascii=False)
-            except Exception:
-                self.verify_data = str(verify_data)
+        self._verify_raw = verify_data
+
+    @cached_property
+    def verify_data(self) -> str:
+        """verify_data 的字符串形式，首次读取时序列化一次"""
+        if isinstance(self._verify_raw, str):
+            return self._verify_raw
+        try:
+            return orjson.dumps(self._verify_raw, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return str(self._verify_raw)
 
     async def model_1(self, state: State) -> State:
         if not self.llm_model_id:
             raise ValueError("llm_model_id is required but not provided")
-        with get_db_context() as db:
-            factory = MemoryClientFactory(db)
-            llm_client = factory.get_llm_client(self.llm_model_id)
+        # 同步 DB 查询放到线程池执行，避免阻塞事件循环
+        llm_client = await asyncio.to_thread(build_llm_client_by_model_id, self.llm_model_id)
         response_content = await llm_client.chat(
             messages=[{"role": "system", "content": self.system_prompt}, *_to_openai_messages(state["messages"])]
         )
@@ -4,6 +4,7 @@ Write Tools for Memory Knowledge Extraction Pipeline
 This module provides the main write function for executing the knowledge extraction
 pipeline. Only MemoryConfig is needed - clients are constructed internally.
 """
+import asyncio
 import time
 from datetime import datetime
 
@@ -16,7 +17,7 @@ from app.core.memory.storage_services.extraction_engine.knowledge_extraction.mem
     memory_summary_generation,
 )
 from app.core.memory.utils.llm.llm_utils import MemoryClientFactory
-from app.core.memory.utils.log.logging_utils import log_time
+from app.core.memory.utils.log.logging_utils import log_time, write_time_log
 from app.db import get_db_context
 from app.repositories.neo4j.add_edges import add_memory_summary_statement_edges
 from app.repositories.neo4j.add_nodes import add_memory_summary_nodes
@@ -72,114 +73,122 @@ async def write(
         embedder_client = factory.get_embedder_client_from_config(memory_config)
     logger.info("LLM and embedding clients constructed")
 
-    # Initialize timing log
+    # Initialize timing log: entries are buffered and written once at the end,
+    # so the pipeline does not block the event loop on file appends
     log_file = "logs/time.log"
+    time_log: list[str] = []
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(f"\n=== Pipeline Run Started: {timestamp} ===\n")
-        f.write(f"Config: {memory_config.config_name} (ID: {config_id})\n")
-
-    pipeline_start = time.time()
-
-    # Initialize Neo4j connector
-    neo4j_connector = Neo4jConnector()
-
-    # Step 1: Load and chunk data
-    step_start = time.time()
-    chunked_dialogs = await get_chunked_dialogs(
-        chunker_strategy=chunker_strategy,
-        group_id=group_id,
-        user_id=user_id,
-        apply_id=apply_id,
-        content=content,
-        ref_id=ref_id,
-        config_id=config_id,
-    )
-    log_time("Data Loading & Chunking", time.time() - step_start, log_file)
-
-    # Step 2: Initialize and run ExtractionOrchestrator
-    step_start = time.time()
-    from app.core.memory.utils.config.config_utils import get_pipeline_config
-    pipeline_config = get_pipeline_config(memory_config)
-
-    orchestrator = ExtractionOrchestrator(
-        llm_client=llm_client,
-        embedder_client=embedder_client,
-        connector=neo4j_connector,
-        config=pipeline_config,
-        embedding_id=embedding_model_id,
-    )
-
-    # Run the complete extraction pipeline
-    (
-        all_dialogue_nodes,
-        all_chunk_nodes,
-        all_statement_nodes,
-        all_entity_nodes,
-        all_statement_chunk_edges,
-        all_statement_entity_edges,
-        all_entity_entity_edges,
-        all_dedup_details,
-    ) = await orchestrator.run(chunked_dialogs, is_pilot_run=False)
-
-    log_time("Extraction Pipeline", time.time() - step_start, log_file)
-
-    # Step 3: Save all data to Neo4j database
-    step_start = time.time()
-    from app.repositories.neo4j.create_indexes import create_fulltext_indexes
-    try:
-        await create_fulltext_indexes()
-    except Exception as e:
-        logger.error(f"Error creating indexes: {e}", exc_info=True)
+    time_log.append(f"\n=== Pipeline Run Started: {timestamp} ===\n")
+    time_log.append(f"Config: {memory_config.config_name} (ID: {config_id})\n")
 
     try:
-        success = await save_dialog_and_statements_to_neo4j(
-            dialogue_nodes=all_dialogue_nodes,
-            chunk_nodes=all_chunk_nodes,
-            statement_nodes=all_statement_nodes,
-            entity_nodes=all_entity_nodes,
-            statement_chunk_edges=all_statement_chunk_edges,
-            statement_entity_edges=all_statement_entity_edges,
-            entity_edges=all_entity_entity_edges,
-            connector=neo4j_connector
+        pipeline_start = time.time()
+
+        # Initialize Neo4j connector
+        neo4j_connector = Neo4jConnector()
+
+        # Step 1: Load and chunk data
+        step_start = time.time()
+        chunked_dialogs = await get_chunked_dialogs(
+            chunker_strategy=chunker_strategy,
+            group_id=group_id,
+            user_id=user_id,
+            apply_id=apply_id,
+            content=content,
+            ref_id=ref_id,
+            config_id=config_id,
         )
-        if success:
-            logger.info("Successfully saved all data to Neo4j")
-        else:
-            logger.warning("Failed to save some data to Neo4j")
-    finally:
-        await neo4j_connector.close()
-
-    log_time("Neo4j Database Save", time.time() - step_start, log_file)
-
-    # Step 4: Generate Memory summaries and save to Neo4j
-    step_start = time.time()
-    try:
-        summaries = await memory_summary_generation(
-            chunked_dialogs, llm_client=llm_client, embedder_client=embedder_client
+        log_time("Data Loading & Chunking", time.time() - step_start, log_file, sink=time_log.append)
+
+        # Step 2: Initialize and run ExtractionOrchestrator
+        step_start = time.time()
+        from app.core.memory.utils.config.config_utils import get_pipeline_config
+        pipeline_config = get_pipeline_config(memory_config)
+
+        orchestrator = ExtractionOrchestrator(
+            llm_client=llm_client,
+            embedder_client=embedder_client,
+            connector=neo4j_connector,
+            config=pipeline_config,
+            embedding_id=embedding_model_id,
         )
 
+        # Run the complete extraction pipeline
+        (
+            all_dialogue_nodes,
+            all_chunk_nodes,
+            all_statement_nodes,
+            all_entity_nodes,
+            all_statement_chunk_edges,
+            all_statement_entity_edges,
+            all_entity_entity_edges,
+            all_dedup_details,
+        ) = await orchestrator.run(chunked_dialogs, is_pilot_run=False)
+
+        log_time("Extraction Pipeline", time.time() - step_start, log_file, sink=time_log.append)
+
+        # Step 3: Save all data to Neo4j database
+        async def _save_graph() -> None:
+            step_start = time.time()
+            from app.repositories.neo4j.create_indexes import create_fulltext_indexes
+            try:
+                await create_fulltext_indexes()
+            except Exception as e:
+                logger.error(f"Error creating indexes: {e}", exc_info=True)
+
+            success = await save_dialog_and_statements_to_neo4j(
+                dialogue_nodes=all_dialogue_nodes,
+                chunk_nodes=all_chunk_nodes,
+                statement_nodes=all_statement_nodes,
+                entity_nodes=all_entity_nodes,
+                statement_chunk_edges=all_statement_chunk_edges,
+                statement_entity_edges=all_statement_entity_edges,
+                entity_edges=all_entity_entity_edges,
+                connector=neo4j_connector
+            )
+            if success:
+                logger.info("Successfully saved all data to Neo4j")
+            else:
+                logger.warning("Failed to save some data to Neo4j")
+
+            log_time("Neo4j Database Save", time.time() - step_start, log_file, sink=time_log.append)
+
+        # Steps 3 and 4 share the connector (and its driver pool); it is closed once afterwards
         try:
-            ms_connector = Neo4jConnector()
-            await add_memory_summary_nodes(summaries, ms_connector)
-            await add_memory_summary_statement_edges(summaries, ms_connector)
-        finally:
+            # Memory summary generation (LLM + embedding) only needs chunked_dialogs,
+            # so it runs concurrently with the Step 3 graph save
+            summary_start = time.time()
+            save_result, summaries = await asyncio.gather(
+                _save_graph(),
+                memory_summary_generation(
+                    chunked_dialogs, llm_client=llm_client, embedder_client=embedder_client
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(save_result, BaseException):
+                raise save_result
+
+            # Step 4: Save Memory summaries to Neo4j (edges reference the statements saved above)
             try:
-                await ms_connector.close()
-            except Exception:
-                pass
-    except Exception as e:
-        logger.error(f"Memory summary step failed: {e}", exc_info=True)
-    finally:
-        log_time("Memory Summary (Neo4j)", time.time() - step_start, log_file)
+                if isinstance(summaries, BaseException):
+                    raise summaries
+                await add_memory_summary_nodes(summaries, neo4j_connector)
+                await add_memory_summary_statement_edges(summaries, neo4j_connector)
+            except Exception as e:
+                logger.error(f"Memory summary step failed: {e}", exc_info=True)
+            finally:
+                log_time("Memory Summary (Neo4j)", time.time() - summary_start, log_file, sink=time_log.append)
+        finally:
+            await neo4j_connector.close()
 
-    # Log total pipeline time
-    total_time = time.time() - pipeline_start
-    log_time("TOTAL PIPELINE TIME", total_time, log_file)
+        # Log total pipeline time
+        total_time = time.time() - pipeline_start
+        log_time("TOTAL PIPELINE TIME", total_time, log_file, sink=time_log.append)
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(f"=== Pipeline Run Completed: {timestamp} ===\n\n")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        time_log.append(f"=== Pipeline Run Completed: {timestamp} ===\n\n")
+    finally:
+        await asyncio.to_thread(write_time_log, time_log, log_file)
 
     logger.info("=== Pipeline Complete ===")
     logger.info(f"Total execution time: {total_time:.2f} seconds")
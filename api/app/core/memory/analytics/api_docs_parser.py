@@ -1,11 +1,20 @@
 import os
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Tuple
+
+_PAT_META_BLOCK = re.compile(r"```javascript([\s\S]*?)```")
+_PAT_SEARCH_SWITCH = re.compile(r"search_switch：?(\d+)\s*(?:（(.*?)）)?")
+_PAT_STATUS_CODE = re.compile(r"code:(\d+)\.\s*(.*)")
+_PAT_CODE_FENCE = re.compile(r"^`{3,}.*")
+_PAT_REQ_PORT = re.compile(r"请求端口(.*)$")
+_PAT_REQ_METHOD = re.compile(r"请求方式[：:](.*)$")
+_PAT_TITLE = re.compile(r"^#\s*(.+)$", re.M)
+_PAT_SECTION_KEY = re.compile(r"### (描述|输入|输出|请求体参数)")
 
 
 def _parse_meta_block(md_text: str) -> Dict[str, Any]:
     sections: Dict[str, Any] = {}
-    m = re.search(r"```javascript([\s\S]*?)```", md_text)
+    m = _PAT_META_BLOCK.search(md_text)
     if not m:
         return sections
     block = m.group(1)
@@ -15,13 +24,13 @@ def _parse_meta_block(md_text: str) -> Dict[str, Any]:
         s = line.strip()
         if not s:
             continue
-        msw = re.match(r"search_switch：?(\d+)\s*(?:（(.*?)）)?", s)
+        msw = _PAT_SEARCH_SWITCH.match(s)
         if msw:
             val = msw.group(1)
             desc = msw.group(2) or ""
             search_opts.append({"value": val, "desc": desc})
             continue
-        mcode = re.match(r"code:(\d+)\.\s*(.*)", s)
+        mcode = _PAT_STATUS_CODE.match(s)
         if mcode:
             code = mcode.group(1)
             desc = mcode.group(2).strip()
@@ -42,12 +51,12 @@ def _extract_code_block(md_lines: List[str], start_idx: int) -> Tuple[str, int]:
     if i >= len(md_lines):
         return "", i
     start_line = md_lines[i].strip()
-    if not re.match(r"^`{3,}.*", start_line):
+    if not _PAT_CODE_FENCE.match(start_line):
         return "", i
     i += 1
     while i < len(md_lines):
         line = md_lines[i]
-        if re.match(r"^`{3,}.*", line.strip()):
+        if _PAT_CODE_FENCE.match(line.strip()):
             i += 1
             break
         content_lines.append(line)
@@ -55,18 +64,81 @@ def _extract_code_block(md_lines: List[str], start_idx: int) -> Tuple[str, int]:
     return "\n".join(content_lines).strip(), i
 
 
+def _clean_inline(s: str) -> str:
+    s = s.strip()
+    if s.startswith("`") and s.endswith("`"):
+        s = s[1:-1]
+    return s.strip()
+
+
+# Section header handlers: (lines, index of the header line, current section, stripped header) -> next index
+def _handle_port(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    m = _PAT_REQ_PORT.search(s)
+    if m:
+        current["path"] = _clean_inline(m.group(1))
+    return i + 1
+
+
+def _handle_method(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    m = _PAT_REQ_METHOD.search(s)
+    if m:
+        current["method"] = _clean_inline(m.group(1))
+    return i + 1
+
+
+def _handle_desc(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    i += 1
+    desc_lines: List[str] = []
+    while i < len(lines):
+        nl = lines[i]
+        if nl.strip().startswith("### "):
+            break
+        if _PAT_CODE_FENCE.match(nl.strip()):
+            break
+        desc_lines.append(nl.strip())
+        i += 1
+    current["desc"] = "\n".join([x for x in desc_lines if x]).strip() or None
+    return i
+
+
+def _handle_input(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    if "无" in s:
+        current["input"] = "无"
+        return i + 1
+    block, i = _extract_code_block(lines, i + 1)
+    current["input"] = block or None
+    return i
+
+
+def _handle_output(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    block, i = _extract_code_block(lines, i + 1)
+    current["output"] = block or None
+    return i
+
+
+def _handle_body_params(lines: List[str], i: int, current: Dict[str, Any], s: str) -> int:
+    params, i = _parse_body_params_table(lines, i + 1)
+    if params:
+        current["body_params"] = params
+    return i
+
+
+_SECTION_HANDLERS: Dict[str, Callable[[List[str], int, Dict[str, Any], str], int]] = {
+    "请求端口": _handle_port,
+    "请求方式": _handle_method,
+    "描述": _handle_desc,
+    "输入": _handle_input,
+    "输出": _handle_output,
+    "请求体参数": _handle_body_params,
+}
+
+
 def _parse_sections(md_text: str) -> List[Dict[str, Any]]:
     lines = md_text.splitlines()
     sections: List[Dict[str, Any]] = []
     i = 0
     current: Dict[str, Any] | None = None
 
-    def _clean_inline(s: str) -> str:
-        s = s.strip()
-        if s.startswith("`") and s.endswith("`"):
-            s = s[1:-1]
-        return s.strip()
-
     while i < len(lines):
         line = lines[i]
         if line.startswith("# ") and "：" in line:
@@ -77,50 +149,17 @@ def _parse_sections(md_text: str) -> List[Dict[str, Any]]:
             continue
         if current is not None and line.strip().startswith("### "):
             s = line.strip()
+            # 端口/方式可出现在标题任意位置，其余按标题前缀查表
             if "请求端口" in s:
-                m = re.search(r"请求端口(.*)$", s)
-                if m:
-                    current["path"] = _clean_inline(m.group(1))
-                i += 1
-                continue
-            if "请求方式" in s:
-                m = re.search(r"请求方式[：:](.*)$", s)
-                if m:
-                    current["method"] = _clean_inline(m.group(1))
-                i += 1
-                continue
-            if s.startswith("### 描述"):
-                i += 1
-                desc_lines: List[str] = []
-                while i < len(lines):
-                    nl = lines[i]
-                    if nl.strip().startswith("### "):
-                        break
-                    if re.match(r"^`{3,}.*", nl.strip()):
-                        break
-                    desc_lines.append(nl.strip())
-                    i += 1
-                current["desc"] = "\n".join([x for x in desc_lines if x]).strip() or None
-                continue
-            if s.startswith("### 输入"):
-                if "无" in s:
-                    current["input"] = "无"
-                    i += 1
-                else:
-                    i += 1
-                    block, i = _extract_code_block(lines, i)
-                    current["input"] = block or None
-                continue
-            if s.startswith("### 输出"):
-                i += 1
-                block, i = _extract_code_block(lines, i)
-                current["output"] = block or None
-                continue
-            if s.startswith("### 请求体参数"):
-                i += 1
-                params, i = _parse_body_params_table(lines, i)
-                if params:
-                    current["body_params"] = params
+                key = "请求端口"
+            elif "请求方式" in s:
+                key = "请求方式"
+            else:
+                m = _PAT_SECTION_KEY.match(s)
+                key = m.group(1) if m else None
+            handler = _SECTION_HANDLERS.get(key)
+            if handler is not None:
+                i = handler(lines, i, current, s)
                 continue
         i += 1
     return sections
@@ -131,7 +170,7 @@ def parse_api_docs(file_path: str) -> Dict[str, Any]:
         raise FileNotFoundError(file_path)
     with open(file_path, "r", encoding="utf-8") as f:
         md_text = f.read()
-    m = re.search(r"^#\s*(.+)$", md_text, re.M)
+    m = _PAT_TITLE.search(md_text)
     title = m.group(1).strip() if m else ""
     meta = _parse_meta_block(md_text)
     sections = _parse_sections(md_text)
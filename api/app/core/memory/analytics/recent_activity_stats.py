@@ -10,6 +10,16 @@ except Exception:
     # Fallback: derive project root from this file location
     PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Log line patterns
+_PAT_CHUNK_RENDER = re.compile(r"===\s*RENDERED\s*STATEMENT\s*EXTRACTION\s*PROMPT\s*===")
+_PAT_TRIPLET_START = re.compile(r"\[Triplet\].*statements_to_process\s*=\s*(\d+)")
+_PAT_TRIPLET_DONE = re.compile(
+    r"\[Triplet\].*completed,\s*total_triplets\s*=\s*(\d+),\s*total_entities\s*=\s*(\d+)"
+)
+_PAT_TEMPORAL_DONE = re.compile(
+    r"\[Temporal\].*completed,\s*extracted_valid_ranges\s*=\s*(\d+)"
+)
+
 
 def _get_latest_prompt_log_path() -> str | None:
     """Return the latest prompt log file path under PROJECT_ROOT/logs, or None."""
@@ -67,47 +77,31 @@ def parse_stats_from_log(log_path: str) -> dict:
     triplet_relations_count = 0
     temporal_count = 0
 
-    # Patterns
-    pat_chunk_render = re.compile(r"===\s*RENDERED\s*STATEMENT\s*EXTRACTION\s*PROMPT\s*===")
-    pat_triplet_start = re.compile(r"\[Triplet\].*statements_to_process\s*=\s*(\d+)")
-    pat_triplet_done = re.compile(
-        r"\[Triplet\].*completed,\s*total_triplets\s*=\s*(\d+),\s*total_entities\s*=\s*(\d+)"
-    )
-    pat_temporal_done = re.compile(
-        r"\[Temporal\].*completed,\s*extracted_valid_ranges\s*=\s*(\d+)"
-    )
-
     with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+        # Most lines carry none of the markers: a substring test on each pattern's
+        # literal rules them out before any regex runs
         for line in f:
             # Chunk prompts count (each chunk triggers one statement-extraction prompt render)
-            if pat_chunk_render.search(line):
+            if "RENDERED" in line and _PAT_CHUNK_RENDER.search(line):
                 chunk_count += 1
                 continue
 
-            m1 = pat_triplet_start.search(line)
-            if m1:
-                try:
+            if "[Triplet]" in line:
+                m1 = _PAT_TRIPLET_START.search(line)
+                if m1:
                     statements_count += int(m1.group(1))
-                except Exception:
-                    pass
-                continue
+                    continue
 
-            m2 = pat_triplet_done.search(line)
-            if m2:
-                try:
+                m2 = _PAT_TRIPLET_DONE.search(line)
+                if m2:
                     triplet_relations_count += int(m2.group(1))
                     triplet_entities_count += int(m2.group(2))
-                except Exception:
-                    pass
-                continue
+                    continue
 
-            m3 = pat_temporal_done.search(line)
-            if m3:
-                try:
+            if "[Temporal]" in line:
+                m3 = _PAT_TEMPORAL_DONE.search(line)
+                if m3:
                     temporal_count += int(m3.group(1))
-                except Exception:
-                    pass
-                continue
 
     return {
         "chunk_count": chunk_count,
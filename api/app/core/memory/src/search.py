@@ -551,6 +551,51 @@ def apply_reranker_placeholder(
 #     return reranked_results
 
 
+def _build_embedder(memory_config: "MemoryConfig") -> OpenAIEmbedderClient:
+    """从数据库读取嵌入器配置（按 ID）并构建嵌入客户端"""
+    with get_db_context() as db:
+        config_service = MemoryConfigService(db)
+        embedder_config_dict = config_service.get_embedder_config(str(memory_config.embedding_model_id))
+    rb_config = RedBearModelConfig(
+        model_name=embedder_config_dict["model_name"],
+        provider=embedder_config_dict["provider"],
+        api_key=embedder_config_dict["api_key"],
+        base_url=embedder_config_dict["base_url"],
+        type="llm"
+    )
+    return OpenAIEmbedderClient(model_config=rb_config)
+
+
+async def embed_queries(
+    query_texts: List[str],
+    memory_config: "MemoryConfig",
+) -> List[Optional[List[float]]]:
+    """
+    Embed several search queries with a single embedder request.
+
+    Queries are normalized the same way run_hybrid_search normalizes them, so the
+    returned vectors can be passed straight back as ``query_embedding``.
+
+    Args:
+        query_texts: Raw query strings
+        memory_config: MemoryConfig object containing embedding_model_id
+
+    Returns:
+        One embedding per input query (None for queries that are empty after cleaning)
+    """
+    cleaned = [extract_plain_query(q) for q in query_texts]
+    positions = [i for i, q in enumerate(cleaned) if q and q.strip()]
+    results: List[Optional[List[float]]] = [None] * len(query_texts)
+    if not positions:
+        return results
+
+    embedder = _build_embedder(memory_config)
+    embeddings = await embedder.response([cleaned[i] for i in positions])
+    for i, embedding in zip(positions, embeddings):
+        results[i] = embedding or None
+    return results
+
+
 async def run_hybrid_search(
     query_text: str,
     search_type: str,
@@ -562,6 +607,7 @@ async def run_hybrid_search(
     rerank_alpha: float = 0.6,
     use_forgetting_rerank: bool = False,
     use_llm_rerank: bool = False,
+    query_embedding: Optional[List[float]] = None,
 ):
     """
 
@@ -569,6 +615,8 @@ async def run_hybrid_search(
     
     Args:
         memory_config: MemoryConfig object containing embedding_model_id and config_id
+        query_embedding: Precomputed embedding of the query (see embed_queries);
+            when given, the embedder is not built or called
     """
     # Start overall timing
     search_start_time = time.time()
@@ -624,26 +672,14 @@ async def run_hybrid_search(
             logger.info("Starting embedding search...")
             embedding_start = time.time()
             
-            # 从数据库读取嵌入器配置（按 ID）并构建 RedBearModelConfig
-            config_load_start = time.time()
-            with get_db_context() as db:
-                config_service = MemoryConfigService(db)
-                embedder_config_dict = config_service.get_embedder_config(str(memory_config.embedding_model_id))
-            rb_config = RedBearModelConfig(
-                model_name=embedder_config_dict["model_name"],
-                provider=embedder_config_dict["provider"],
-                api_key=embedder_config_dict["api_key"],
-                base_url=embedder_config_dict["base_url"],
-                type="llm"
-            )
-            config_load_time = time.time() - config_load_start
-            logger.info(f"Config loading took {config_load_time:.4f}s")
-
-            # Init embedder
-            embedder_init_start = time.time()
-            embedder = OpenAIEmbedderClient(model_config=rb_config)
-            embedder_init_time = time.time() - embedder_init_start
-            logger.info(f"Embedder init took {embedder_init_time:.4f}s")
+            if query_embedding:
+                embedder = None
+            else:
+                # 从数据库读取嵌入器配置（按 ID）并构建嵌入客户端
+                embedder_init_start = time.time()
+                embedder = _build_embedder(memory_config)
+                embedder_init_time = time.time() - embedder_init_start
+                logger.info(f"Embedder config loading and init took {embedder_init_time:.4f}s")
             
             embedding_task = asyncio.create_task(
                 search_graph_by_embedding(
@@ -653,6 +689,7 @@ async def run_hybrid_search(
                     group_id=group_id,
                     limit=limit,
                     include=include,
+                    query_embedding=query_embedding,
                 )
             )
 
@@ -17,6 +17,7 @@ from app.core.logging_config import (
     log_prompt_rendering as _log_prompt_rendering,
     log_template_rendering as _log_template_rendering,
     log_time as _log_time,
+    write_time_log as _write_time_log,
     get_prompt_logger as _get_prompt_logger,
 )
 
@@ -24,6 +25,7 @@ from app.core.logging_config import (
 log_prompt_rendering = _log_prompt_rendering
 log_template_rendering = _log_template_rendering
 log_time = _log_time
+write_time_log = _write_time_log
 
 # Re-export prompt_logger for backward compatibility with code that uses it directly
 # This provides the same logger instance that was previously created in this module
@@ -34,5 +36,6 @@ __all__ = [
     'log_prompt_rendering',
     'log_template_rendering',
     'log_time',
+    'write_time_log',
     'prompt_logger',
 ]
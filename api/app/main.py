@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from fastapi import HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 # 管理端 API (JWT 认证)
 from app.controllers import manager_router
@@ -15,6 +15,7 @@ from app.core.config import settings
 from app.core.error_codes import BizCode, HTTP_MAPPING
 from app.core.exceptions import BusinessException
 from app.core.logging_config import LoggingConfig, get_logger
+from app.core.memory.agent.multimodal._http import aclose_async_client
 from app.core.response_utils import fail
 
 # Initialize logging system
@@ -51,6 +52,8 @@ async def lifespan(app: FastAPI):
     yield
     # 应用关闭事件
     logger.info("应用程序正在关闭")
+    # 释放多模态上传共用的 HTTP 连接池
+    await aclose_async_client()
 
 
 app = FastAPI(
@@ -58,6 +61,8 @@ app = FastAPI(
     description="redbera-mem",
     version="1.0.0",
     lifespan=lifespan,
+    # 使用 orjson 编码响应体，替代标准库 json
+    default_response_class=ORJSONResponse,
 )
 
 # Enable CORS for frontend access with environment-extendable origins
@@ -132,7 +137,7 @@ async def validation_exception_handler(request: Request, exc: ValidationExceptio
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.VALIDATION_FAILED
     status_code = HTTP_MAPPING.get(biz_code, 400)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -157,7 +162,7 @@ async def not_found_exception_handler(request: Request, exc: ResourceNotFoundExc
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.FILE_NOT_FOUND
     status_code = HTTP_MAPPING.get(biz_code, 404)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -183,7 +188,7 @@ async def permission_denied_handler(request: Request, exc: PermissionDeniedExcep
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.FORBIDDEN
     status_code = HTTP_MAPPING.get(biz_code, 403)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -208,7 +213,7 @@ async def authentication_exception_handler(request: Request, exc: Authentication
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.UNAUTHORIZED
     status_code = HTTP_MAPPING.get(biz_code, 401)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -233,7 +238,7 @@ async def authorization_exception_handler(request: Request, exc: AuthorizationEx
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.FORBIDDEN
     status_code = HTTP_MAPPING.get(biz_code, 403)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -259,7 +264,7 @@ async def file_upload_exception_handler(request: Request, exc: FileUploadExcepti
     )
     biz_code = exc.code if isinstance(exc.code, BizCode) else BizCode.FILE_READ_ERROR
     status_code = HTTP_MAPPING.get(biz_code, 500)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -287,7 +292,7 @@ async def rate_limit_exception_handler(request: Request, exc: RateLimitException
     status_code = HTTP_MAPPING.get(biz_code, 429)
 
     # 创建响应对象并添加限流头信息
-    response = JSONResponse(
+    response = ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -330,7 +335,7 @@ async def business_exception_handler(request: Request, exc: BusinessException):
         biz_code = BizCode.BAD_REQUEST
 
     status_code = HTTP_MAPPING.get(biz_code, 400)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=fail(code=biz_code.value, msg=filtered_message, error=filtered_message)
     )
@@ -351,7 +356,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "status_code": exc.status_code
         }
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=fail(code=exc.status_code, msg=filtered_detail, error=filtered_detail)
     )
@@ -381,7 +386,7 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
         # 开发环境也要过滤敏感信息
         message = SensitiveDataFilter.filter_string(str(exc))
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=fail(code=BizCode.INTERNAL_ERROR.value, msg=message, error=message)
     )
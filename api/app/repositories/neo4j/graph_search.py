@@ -116,6 +116,7 @@ async def search_graph_by_embedding(
     group_id: Optional[str] = None,
     limit: int = 50,
     include: List[str] = ["statements", "chunks", "entities","summaries"],
+    query_embedding: Optional[List[float]] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Embedding-based semantic search across Statements, Chunks, and Entities.
@@ -123,21 +124,26 @@ async def search_graph_by_embedding(
     OPTIMIZED: Runs all queries in parallel using asyncio.gather()
 
     - Computes query embedding with the provided embedder_client
+      (skipped when a precomputed query_embedding is passed)
     - Ranks by cosine similarity in Cypher
     - Filters by group_id if provided
     - Returns up to 'limit' per included type
     """
     import time
     
-    # Get embedding for the query
-    embed_start = time.time()
-    embeddings = await embedder_client.response([query_text])
-    embed_time = time.time() - embed_start
-    print(f"[PERF] Embedding generation took: {embed_time:.4f}s")
-    
-    if not embeddings or not embeddings[0]:
-        return {"statements": [], "chunks": [], "entities": [], "summaries": []}
-    embedding = embeddings[0]
+    if query_embedding:
+        # Embedding already computed by the caller (e.g. batched with other queries)
+        embedding = query_embedding
+    else:
+        # Get embedding for the query
+        embed_start = time.time()
+        embeddings = await embedder_client.response([query_text])
+        embed_time = time.time() - embed_start
+        print(f"[PERF] Embedding generation took: {embed_time:.4f}s")
+        
+        if not embeddings or not embeddings[0]:
+            return {"statements": [], "chunks": [], "entities": [], "summaries": []}
+        embedding = embeddings[0]
 
     # Prepare tasks for parallel execution
     tasks = []
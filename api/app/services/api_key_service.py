@@ -1,10 +1,13 @@
 """API Key Service"""
+import asyncio
+import threading
 import time
 import uuid
 import math
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
 
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
@@ -22,6 +25,11 @@ from app.core.logging_config import get_business_logger
 
 logger = get_business_logger()
 
+# 已验证 API Key 的进程内缓存：明文 Key -> 快照，命中时跳过数据库查询
+# TTL 限定了多进程部署下删除/停用操作的最长生效延迟
+_validated_key_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_validated_key_cache_lock = threading.Lock()
+
 
 class ApiKeyService:
     """API Key 业务逻辑服务"""
@@ -155,6 +163,7 @@ class ApiKeyService:
         update_data = data.model_dump(exclude_unset=True)
         ApiKeyRepository.update(db, api_key_id, update_data)
         db.commit()
+        ApiKeyAuthService.invalidate_cache(api_key.api_key)
         db.refresh(api_key)
 
         logger.info("API Key 更新成功", extra={"api_key_id": str(api_key_id)})
@@ -168,9 +177,11 @@ class ApiKeyService:
     ) -> bool:
         """删除 API Key"""
         api_key = ApiKeyService.get_api_key(db, api_key_id, workspace_id)
+        plain_key = api_key.api_key
 
         ApiKeyRepository.delete(db, api_key_id)
         db.commit()
+        ApiKeyAuthService.invalidate_cache(plain_key)
 
         logger.info("API Key 删除成功", extra={"api_key_id": str(api_key_id)})
         return True
@@ -190,12 +201,14 @@ class ApiKeyService:
 
         # 生成新的 API Key
         new_api_key = generate_api_key(api_key.type)
+        old_api_key = api_key.api_key
 
         # 更新
         ApiKeyRepository.update(db, api_key_id, {
             "api_key": new_api_key
         })
         db.commit()
+        ApiKeyAuthService.invalidate_cache(old_api_key)
         db.refresh(api_key)
 
         logger.info("API Key 重新生成成功", extra={"api_key_id": str(api_key_id)})
@@ -373,6 +386,59 @@ class ApiKeyAuthService:
 
         return api_key_obj
 
+    @staticmethod
+    async def validate_api_key_async(
+            db: Session,
+            api_key: str
+    ) -> Optional[api_key_schema.ApiKey]:
+        """
+        带进程内 TTL 缓存的 API Key 验证
+
+        命中缓存时仅重新检查过期时间；设置了配额限制的 Key 不缓存，
+        保证配额检查始终基于数据库中的最新用量。
+        缓存命中直接在事件循环内返回；仅缓存未命中时才把同步的数据库查询
+        放到工作线程执行，避免突发鉴权请求阻塞事件循环。
+
+        Returns:
+            API Key 快照（与数据库会话解绑），无效时返回 None
+        """
+        hit, cached = ApiKeyAuthService._lookup_cache(api_key)
+        if hit:
+            return cached
+        return await asyncio.to_thread(ApiKeyAuthService._validate_and_cache, db, api_key)
+
+    @staticmethod
+    def _lookup_cache(api_key: str) -> Tuple[bool, Optional[api_key_schema.ApiKey]]:
+        """查询验证缓存，返回 (是否命中, 快照)；命中但已过期时视为无效"""
+        with _validated_key_cache_lock:
+            cached = _validated_key_cache.get(api_key)
+
+        if cached is None:
+            return False, None
+        if cached.expires_at and datetime.now() > cached.expires_at:
+            ApiKeyAuthService.invalidate_cache(api_key)
+            return True, None
+        return True, cached
+
+    @staticmethod
+    def _validate_and_cache(db: Session, api_key: str) -> Optional[api_key_schema.ApiKey]:
+        """查询数据库验证 API Key，并在允许时写入缓存"""
+        api_key_obj = ApiKeyAuthService.validate_api_key(db, api_key)
+        if not api_key_obj:
+            return None
+
+        snapshot = api_key_schema.ApiKey.model_validate(api_key_obj)
+        if not snapshot.quota_limit:
+            with _validated_key_cache_lock:
+                _validated_key_cache[api_key] = snapshot
+        return snapshot
+
+    @staticmethod
+    def invalidate_cache(api_key: str) -> None:
+        """从验证缓存中移除指定 API Key（更新、删除、重新生成时调用）"""
+        with _validated_key_cache_lock:
+            _validated_key_cache.pop(api_key, None)
+
     @staticmethod
     def check_scope(api_key: ApiKey, required_scope: str) -> bool:
         """检查权限范围"""
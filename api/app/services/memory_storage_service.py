@@ -567,7 +567,8 @@ async def analytics_hot_memory_tags(
 
 
 async def analytics_recent_activity_stats() -> Dict[str, Any]:
-    stats, _msg = get_recent_activity_stats()
+    # 日志扫描是同步文件 I/O，放到线程池执行，避免阻塞事件循环
+    stats, _msg = await asyncio.to_thread(get_recent_activity_stats)
     total = (
         stats.get("chunk_count", 0)
         + stats.get("statements_count", 0)